@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+
+from typing import Self
+
+from manim3 import *
+
+
+class CoplanarOpaqueExample(Scene):
+    async def construct(
+        self: Self
+    ) -> None:
+        # Opaque shapes all lie at z=0, and are layered in the order they are added,
+        # each covering the previous one. Alternating shapes and lightings place neighbours
+        # into different draw batches, which shall not alter the layering.
+        lightings = (
+            Lighting(AmbientLight()),
+            Lighting(AmbientLight().set(color=GREY_B))
+        )
+        self.add(*(
+            (Square() if index % 2 else Circle())
+            .set(color=color)
+            .add_strokes(color=WHITE, weight=5.0)
+            .bind_lighting(lightings[index % 2])
+            .shift(0.8 * index * RIGHT)
+            for index, color in enumerate((RED, GREEN, BLUE, YELLOW, PURPLE, TEAL))
+        ))
+        await self.wait(5.0)
+
+
+if __name__ == "__main__":
+    with (
+        Config(),
+        Toplevel.livestream()
+    ):
+        CoplanarOpaqueExample().run()
@@ -0,0 +1,48 @@
+from __future__ import annotations
+
+
+import time
+from typing import Self
+
+from manim3 import *
+
+
+class FamilyBenchmarkExample(Scene):
+    async def construct(
+        self: Self
+    ) -> None:
+        n = 10000
+        k = 100
+
+        root = Mobject()
+        start = time.perf_counter()
+        for _ in range(n):
+            root.add(Mobject())
+        print(f"Flat tree, added one by one: {time.perf_counter() - start:.3f} s")
+
+        root = Mobject()
+        start = time.perf_counter()
+        root.add(*(Mobject() for _ in range(n)))
+        print(f"Flat tree, added in bulk: {time.perf_counter() - start:.3f} s")
+
+        root = Mobject()
+        groups = [Mobject() for _ in range(k)]
+        root.add(*groups)
+        start = time.perf_counter()
+        for group in groups:
+            for _ in range(n // k):
+                group.add(Mobject())
+        print(f"Nested tree, added one by one: {time.perf_counter() - start:.3f} s")
+
+        start = time.perf_counter()
+        for group in groups:
+            group.discard(*tuple(group.iter_children())[::2])
+        print(f"Nested tree, discarded by halves: {time.perf_counter() - start:.3f} s")
+
+
+if __name__ == "__main__":
+    with (
+        Config(),
+        Toplevel.livestream()
+    ):
+        FamilyBenchmarkExample().run()
@@ -0,0 +1,65 @@
+from __future__ import annotations
+
+
+import timeit
+from typing import Self
+
+import numpy as np
+from manim3 import *
+from manim3.rendering.field import Field
+
+
+def legacy_write(
+    field: Field,
+    shape: tuple[int, ...],
+    data_dict: dict[str, np.ndarray]
+) -> bytes:
+    # Packing through a zeroed structured array, as done before packing plans.
+    np_buffer, np_buffer_pointers = field._get_np_buffer_and_pointers(shape)
+    for key, (np_buffer_pointer, base_ndim) in np_buffer_pointers.items():
+        data = data_dict[key]
+        if not np_buffer_pointer.size:
+            assert not data.size
+            continue
+        np_buffer_pointer[...] = np.expand_dims(data, axis=tuple(range(-2, -base_ndim)))
+    return np_buffer.tobytes()
+
+
+class PackingBenchmarkExample(Scene):
+    async def construct(
+        self: Self
+    ) -> None:
+        number = 2000
+
+        sphere = Sphere()
+        lighting = Lighting(
+            AmbientLight(),
+            *(PointLight().shift(direction) for direction in (LEFT, RIGHT, UP, DOWN))
+        )
+        for block_name, uniform_block_buffer in (
+            ("Material", sphere._material_uniform_block_buffer_),
+            ("Lighting", lighting._lighting_uniform_block_buffer_),
+            ("Model", sphere._model_uniform_block_buffer_)
+        ):
+            field = uniform_block_buffer._field_
+            shape = uniform_block_buffer._shape_
+            data_dict = uniform_block_buffer._data_dict_
+            buffer = field.write(shape, data_dict)
+            assert bytes(buffer) == legacy_write(field, shape, data_dict)
+
+            legacy_time = timeit.timeit(lambda: legacy_write(field, shape, data_dict), number=number)
+            write_time = timeit.timeit(lambda: field.write(shape, data_dict), number=number)
+            write_into_time = timeit.timeit(lambda: field.write_into(shape, data_dict, buffer), number=number)
+            print(
+                f"{block_name} block: "
+                f"legacy {legacy_time / number * 1e6:.1f} us, "
+                f"write {write_time / number * 1e6:.1f} us, "
+                f"write_into {write_into_time / number * 1e6:.1f} us"
+            )
+
+
+if __name__ == "__main__":
+    with Config(
+        headless=True
+    ):
+        PackingBenchmarkExample().run()
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+
+import time
+from typing import Self
+
+from manim3 import *
+
+
+class RecordingBenchmarkExample(Scene):
+    async def construct(
+        self: Self
+    ) -> None:
+        duration = 5.0
+
+        spheres = [
+            Sphere()
+            .scale(0.5)
+            .shift(2.0 * (i - 2) * RIGHT + 2.0 * (j - 1) * UP)
+            .set(opacity=0.25 + 0.25 * (i % 3))
+            for i in range(5)
+            for j in range(3)
+        ]
+        self.add(*spheres)
+        self.prepare(self.camera.animate(infinite=True).rotate_about_origin(0.2 * DOWN))
+
+        start = time.perf_counter()
+        await self.wait(duration)
+        elapsed = time.perf_counter() - start
+        frames = int(duration * Toplevel._get_config().fps)
+        print(f"Recorded {frames} frames in {elapsed:.3f} s: {frames / elapsed:.1f} fps")
+
+
+if __name__ == "__main__":
+    with (
+        Config(
+            fps=60,
+            pixel_height=1080
+        ),
+        Toplevel.recording("recording_benchmark.mp4")
+    ):
+        RecordingBenchmarkExample().run()
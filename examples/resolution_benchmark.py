@@ -0,0 +1,126 @@
+from __future__ import annotations
+
+
+import timeit
+from typing import (
+    Any,
+    Self
+)
+
+from manim3 import *
+from manim3.lazy.lazy_descriptor import (
+    LazyDescriptor,
+    Memoized
+)
+
+
+class LegacyTree:
+    __slots__ = (
+        "_content",
+        "_children"
+    )
+
+    def __init__(
+        self: Self,
+        content: Memoized
+    ) -> None:
+        super().__init__()
+        self._content: Memoized = content
+        self._children: tuple[LegacyTree, ...] | None = None
+
+    def iter_leaves(
+        self: Self
+    ) -> Any:
+        if (children := self._children) is None:
+            yield self
+            return
+        for child in children:
+            yield from child.iter_leaves()
+
+    def as_tuple_tree(
+        self: Self,
+        func: Any
+    ) -> Any:
+        if (children := self._children) is None:
+            return func(self._content)
+        return tuple(child.as_tuple_tree(func) for child in children)
+
+
+def legacy_resolve(
+    descriptor: LazyDescriptor,
+    instance: LazyObject
+) -> tuple[Any, Any]:
+    # Parameter resolution through trees walked name by name, as done before precompiled steps.
+    trees = tuple(LegacyTree(Memoized(instance)) for _ in descriptor._parameter_name_chains)
+    associated_slots = set()
+    for name_chain, tree in zip(descriptor._parameter_name_chains, trees, strict=True):
+        for name in name_chain:
+            for leaf in tree.iter_leaves():
+                leaf_object = leaf._content.get_value()
+                leaf_slot = leaf_object._get_lazy_slot(name)
+                leaf_descriptor = leaf_slot.get_descriptor()
+                elements = leaf_descriptor._get_memoized_elements(leaf_object)
+                if leaf_descriptor._plural:
+                    leaf._children = tuple(LegacyTree(element) for element in elements)
+                else:
+                    (leaf._content,) = elements
+                if leaf_descriptor._is_property:
+                    associated_slots.update(leaf_slot.iter_associated_slots())
+                else:
+                    associated_slots.add(leaf_slot)
+    key = tuple(tree.as_tuple_tree(Memoized.get_id) for tree in trees)
+    values = tuple(tree.as_tuple_tree(Memoized.get_value) for tree in trees)
+    return key, values
+
+
+def compiled_resolve(
+    descriptor: LazyDescriptor,
+    instance: LazyObject
+) -> tuple[Any, Any]:
+    associated_slots = set()
+    pairs = tuple(
+        parameter_first_step.resolve(instance, associated_slots)
+        for parameter_first_step in descriptor._parameter_first_steps
+    )
+    return tuple(key for key, _ in pairs), tuple(values for _, values in pairs)
+
+
+class ResolutionBenchmarkExample(Scene):
+    async def construct(
+        self: Self
+    ) -> None:
+        number = 20000
+
+        sphere = Sphere()
+        self.add(sphere)
+        for instance, name in (
+            # Includes the deep chain `lighting__lighting_uniform_block_buffer`.
+            (sphere, "_mesh_uniform_block_buffers_"),
+            (sphere, "_box_"),
+            (sphere, "_model_uniform_block_buffer_")
+        ):
+            descriptor = type(instance)._annotated_lazy_descriptors[name][1]
+            slot = descriptor.get_slot(instance)
+            descriptor._get_memoized_elements(instance)
+            assert legacy_resolve(descriptor, instance)[0] == compiled_resolve(descriptor, instance)[0]
+
+            def get_memoized_elements_on_miss() -> None:
+                slot.expire()
+                descriptor._get_memoized_elements(instance)
+
+            legacy_time = min(timeit.repeat(lambda: legacy_resolve(descriptor, instance), number=number, repeat=3))
+            compiled_time = min(timeit.repeat(lambda: compiled_resolve(descriptor, instance), number=number, repeat=3))
+            miss_time = min(timeit.repeat(get_memoized_elements_on_miss, number=number, repeat=3))
+            print(
+                f"{type(instance).__name__}.{name} ({len(descriptor._parameter_name_chains)} chains): "
+                f"legacy resolution {legacy_time / number * 1e6:.2f} us, "
+                f"compiled resolution {compiled_time / number * 1e6:.2f} us, "
+                f"_get_memoized_elements on miss {miss_time / number * 1e6:.2f} us"
+            )
+
+
+if __name__ == "__main__":
+    with Config(
+        headless=True
+    ):
+        ResolutionBenchmarkExample().run()
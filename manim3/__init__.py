@@ -3,6 +3,14 @@ from __future__ import annotations
 
 __version__ = "0.1.0"
 
+import pyglet
+
+# Without a shadow window, pyglet does not connect to a display until a window is created.
+# Without gl debugging, pyglet gl functions do not require a pyglet context, and may be called within
+# a standalone context. Both allow scenes to be rendered headlessly.
+pyglet.options["shadow_window"] = False
+pyglet.options["debug_gl"] = False
+
 from .animatables.lights.ambient_light import AmbientLight
 from .animatables.lights.point_light import PointLight
 from .animatables.camera import Camera
@@ -24,6 +32,7 @@ from .lazy.lazy_object import LazyObject
 from .mobjects.graph_mobjects.graph_mobject import GraphMobject
 from .mobjects.graph_mobjects.line import Line
 from .mobjects.graph_mobjects.polyline import Polyline
+from .mobjects.mesh_mobjects.instanced_mesh_mobject import InstancedMeshMobject
 from .mobjects.mesh_mobjects.parametric_surface import ParametricSurface
 from .mobjects.mesh_mobjects.plane import Plane
 from .mobjects.mesh_mobjects.sphere import Sphere
@@ -143,6 +143,12 @@ class AnimatableInterpolateAnimation[AnimatableT: Animatable](Animation):
     def _src_1_() -> AnimatableT:
         return NotImplemented
 
+    def _iter_sources(
+        self: Self
+    ) -> Iterator[AnimatableT]:
+        yield self._src_0_
+        yield self._src_1_
+
     @abstractmethod
     def interpolate(
         self: Self,
@@ -3,6 +3,8 @@ from __future__ import annotations
 
 import weakref
 from typing import (
+    ClassVar,
+    Iterator,
     Self,
     TypedDict,
     Unpack
@@ -10,6 +12,8 @@ from typing import (
 
 from ...constants.custom_typing import RateType
 from ...constants.rates import Rates
+from ...lazy.lazy import Lazy
+from ...lazy.lazy_descriptor import LazyDescriptor
 from ...lazy.lazy_object import LazyObject
 from ...timelines.timeline import Timeline
 
@@ -23,6 +27,11 @@ class AnimateKwargs(TypedDict, total=False):
 class Animation(LazyObject):
     __slots__ = ()
 
+    # Heavy properties warmed on worker threads when prepared, ahead of playback.
+    # Properties of sources are warmed first, as properties of animations are computed from them.
+    _prefetched_source_descriptors: ClassVar[tuple[LazyDescriptor, ...]] = ()
+    _prefetched_descriptors: ClassVar[tuple[LazyDescriptor, ...]] = ()
+
     def build(
         self: Self,
         **kwargs: Unpack[AnimateKwargs]
@@ -31,6 +40,11 @@ class Animation(LazyObject):
         timeline._animations.append(self)
         return timeline
 
+    def _iter_sources(
+        self: Self
+    ) -> Iterator[LazyObject]:
+        yield from ()
+
     def update(
         self: Self,
         alpha: float
@@ -79,13 +93,28 @@ class AnimationsTimeline(Timeline):
         self._rate: RateType = rate
         self._animations: list[Animation] = []
 
+    def _prefetch(
+        self: Self
+    ) -> None:
+        # Only properties declared by animation classes are warmed, as others may never be read in playback.
+        animations = self._animations
+        Lazy.prefetch(
+            (source for animation in animations for source in animation._iter_sources()),
+            {descriptor for animation in animations for descriptor in type(animation)._prefetched_source_descriptors}
+        )
+        Lazy.prefetch(
+            animations,
+            {descriptor for animation in animations for descriptor in type(animation)._prefetched_descriptors}
+        )
+
     def update(
         self: Self,
         time: float
     ) -> None:
         alpha = self._rate(time)
-        for animation in self._animations:
-            animation.update(alpha)
+        with LazyObject.batch():
+            for animation in self._animations:
+                animation.update(alpha)
 
     async def construct(
         self: Self
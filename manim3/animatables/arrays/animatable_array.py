@@ -36,7 +36,7 @@ class AnimatableArray[NDArrayT: np.ndarray](Animatable):
         if array is not None:
             self._array_ = array
 
-    @Lazy.variable()
+    @Lazy.variable(memoization_mode="digest")
     @staticmethod
     def _array_() -> NDArrayT:
         return NotImplemented
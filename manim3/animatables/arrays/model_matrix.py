@@ -17,7 +17,7 @@ from .animatable_array import AnimatableArray
 class ModelMatrix(AnimatableArray[NP_44f8]):
     __slots__ = ()
 
-    @Lazy.variable()
+    @Lazy.variable(memoization_mode="digest")
     @staticmethod
     def _array_() -> NP_44f8:
         return np.identity(4)
@@ -51,7 +51,7 @@ class Graph(Animatable):
         if edges is not None:
             self._edges_ = edges
 
-    @Lazy.variable()
+    @Lazy.variable(memoization_mode="digest")
     @staticmethod
     def _positions_() -> NP_x3f8:
         return np.zeros((0, 3))
@@ -159,6 +159,9 @@ class GraphInterpolateAnimation[GraphT: Graph](AnimatableInterpolateAnimation[Gr
             edges=edges
         )
 
+    _prefetched_source_descriptors = (Graph._cumlengths_,)
+    _prefetched_descriptors = (_interpolate_info_,)
+
     def interpolate(
         self: Self,
         dst: GraphT,
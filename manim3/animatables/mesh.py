@@ -34,12 +34,12 @@ class Mesh(Animatable):
         if faces is not None:
             self._faces_ = faces
 
-    @Lazy.variable()
+    @Lazy.variable(memoization_mode="digest")
     @staticmethod
     def _positions_() -> NP_x3f8:
         return np.zeros((0, 3))
 
-    @Lazy.variable()
+    @Lazy.variable(memoization_mode="digest")
     @staticmethod
     def _normals_() -> NP_x3f8:
         return np.zeros((0, 3))
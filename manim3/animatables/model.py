@@ -144,30 +144,60 @@ class Model(Animatable):
 
     @Lazy.property()
     @staticmethod
-    def _world_sample_positions_(
+    def _local_support_positions_(
+        local_sample_positions: NP_x3f8
+    ) -> NP_x3f8:
+        # Sample positions are typically gathered per face or per edge, repeating shared vertices.
+        return np.unique(local_sample_positions, axis=0)
+
+    @Lazy.property()
+    @staticmethod
+    def _local_bounds_(
+        local_support_positions: NP_x3f8
+    ) -> NP_x3f8:
+        # Stacked maximum and minimum, or empty if there are no samples.
+        if not len(local_support_positions):
+            return np.zeros((0, 3))
+        return np.array((local_support_positions.max(axis=0), local_support_positions.min(axis=0)))
+
+    @Lazy.property()
+    @staticmethod
+    def _world_bounds_(
         model_matrix__array: NP_44f8,
-        local_sample_positions: NP_x3f8,
+        local_support_positions: NP_x3f8,
+        local_bounds: NP_x3f8
     ) -> NP_x3f8:
-        return ModelMatrix._apply_multiple(model_matrix__array, local_sample_positions)
+        if not len(local_bounds):
+            return local_bounds
+        linear_matrix = model_matrix__array[:3, :3]
+        scale = np.diagonal(linear_matrix)
+        if np.array_equal(model_matrix__array[3], (0.0, 0.0, 0.0, 1.0)) and not np.any(linear_matrix - np.diag(scale)):
+            # Transforms composed of shifts and axis-aligned scales map local bounds to world bounds exactly,
+            # so that the cost does not scale with samples.
+            world_positions = local_bounds * scale + model_matrix__array[:3, 3]
+        else:
+            world_positions = ModelMatrix._apply_multiple(model_matrix__array, local_support_positions)
+        return np.array((world_positions.max(axis=0), world_positions.min(axis=0)))
 
     @Lazy.property()
     @staticmethod
     def _box_(
-        world_sample_positions: NP_x3f8,
-        proper_siblings__world_sample_positions: tuple[NP_x3f8, ...]
+        world_bounds: NP_x3f8,
+        proper_siblings__world_bounds: tuple[NP_x3f8, ...]
     ) -> Box:
-        sample_positions = np.concatenate((
-            world_sample_positions,
-            *proper_siblings__world_sample_positions
+        # Combines bounds of every sibling, each of which is cached separately.
+        bounds = np.concatenate((
+            world_bounds,
+            *proper_siblings__world_bounds
         ))
-        if not len(sample_positions):
+        if not len(bounds):
             return Box(
                 maximum=np.zeros((3,)),
                 minimum=np.zeros((3,))
             )
         return Box(
-            maximum=sample_positions.max(axis=0),
-            minimum=sample_positions.min(axis=0)
+            maximum=bounds.max(axis=0),
+            minimum=bounds.min(axis=0)
         )
 
     def _iter_siblings(
@@ -89,7 +89,7 @@ class Shape(Animatable):
     ) -> Self:
         return self.xor(other)
 
-    @Lazy.variable()
+    @Lazy.variable(memoization_mode="digest")
     @staticmethod
     def _coordinates_() -> NP_x2f8:
         return np.zeros((0, 2))
@@ -121,7 +121,7 @@ class Shape(Animatable):
             edges=np.column_stack((edge_starts, edge_stops))
         )
 
-    @Lazy.property()
+    @Lazy.property(persist=True)
     @staticmethod
     def _triangulation_(
         coordinates: NP_x2f8,
@@ -319,7 +319,7 @@ class ShapeInterpolateInfo:
 class ShapeInterpolateAnimation[ShapeT: Shape](AnimatableInterpolateAnimation[ShapeT]):
     __slots__ = ()
 
-    @Lazy.property()
+    @Lazy.property(persist=True)
     @staticmethod
     def _interpolate_info_(
         src_0: ShapeT,
@@ -335,6 +335,8 @@ class ShapeInterpolateAnimation[ShapeT: Shape](AnimatableInterpolateAnimation[Sh
             counts=counts
         )
 
+    _prefetched_descriptors = (_interpolate_info_,)
+
     def interpolate(
         self: Self,
         dst: ShapeT,
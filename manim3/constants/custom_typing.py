@@ -9,6 +9,7 @@ __all__ = (
     "NP_xf8",
     "NP_x2f8",
     "NP_x3f8",
+    "NP_x44f8",
     "NP_xi4",
     "NP_x2i4",
     "NP_x3i4",
@@ -43,6 +44,7 @@ type NP_44f8 = np.ndarray[tuple[_4D, _4D], np.dtype[np.float64]]
 type NP_xf8 = np.ndarray[tuple[_XD], np.dtype[np.float64]]
 type NP_x2f8 = np.ndarray[tuple[_XD, _2D], np.dtype[np.float64]]
 type NP_x3f8 = np.ndarray[tuple[_XD, _3D], np.dtype[np.float64]]
+type NP_x44f8 = np.ndarray[tuple[_XD, _4D, _4D], np.dtype[np.float64]]
 
 type NP_xi4 = np.ndarray[tuple[_XD], np.dtype[np.int32]]
 type NP_x2i4 = np.ndarray[tuple[_XD, _2D], np.dtype[np.int32]]
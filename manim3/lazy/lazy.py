@@ -83,7 +83,43 @@ parameters:
   Lazy.property: =128
 
   Determines the capacity of the lru cache of parameters-data pairs generated
-  from `method`.
+  from `method`. Each lru cache is further bounded by a byte budget shared by
+  all descriptors, with sizes of ndarrays and gl objects estimated. Evicted
+  data is released (along with gl handles) once no slot refers to it. All lru
+  caches can be cleared through `Lazy.clear_caches`.
+
+- `memoization_mode: MemoizationMode`
+  Lazy.variable: ="content"
+  Lazy.volatile: "identity"
+  Lazy.property: ="content"
+
+  Determines how elements are keyed in the memoization, where elements with
+  equal keys share a single memoized object. "content" keys elements by
+  hashable contents (for ndarrays, the full serialized buffer is held as the
+  key); "digest" keys ndarrays by a fixed-size digest of the buffer instead,
+  and acts as "content" for other types; "identity" keys elements by `id`,
+  skipping content comparison entirely. Takes "identity" whenever `freeze` is
+  false.
+
+- `persist: bool`
+  Lazy.variable: false
+  Lazy.volatile: false
+  Lazy.property: =false
+
+  Determines whether data is additionally stored on disk across runs, keyed by
+  a digest of parameter contents and the method bytecode. Only takes effect
+  when parameters consist of ndarrays, builtin scalars, enums, tuples, attrs
+  classes and lazy objects (with only frozen variables) thereof, and data
+  elements are ndarrays or attrs classes of ndarrays.
+  Meant for expensive computations whose results are stable across runs.
+
+Each descriptor counts its slot hits, lru hits and misses, method invocations,
+compute time, invalidations and memoized bytes. These are collected through
+`Lazy.stats`, and cleared through `Lazy.reset_stats`.
+
+Properties of many objects can be evaluated ahead of first access through
+`Lazy.prefetch`, where methods are invoked on a thread pool. Methods reading
+lazy data of their parameters are safe, but shall not touch the gl context.
 
 Descriptor overriding is allowed. The overriding descriptor should match the
 overridden one in `plural`, `freeze` flags (a change in `freeze` from false to
@@ -94,13 +130,22 @@ variable `T`) should be consistent between descriptors.
 
 from typing import (
     Callable,
+    Iterable,
+    Iterator,
     Literal,
     Never,
     Self,
     overload
 )
 
-from .lazy_descriptor import LazyDescriptor
+from .lazy_cache import LazyCache
+from .lazy_descriptor import (
+    LazyDescriptor,
+    LazyStats,
+    MemoizationMode
+)
+from .lazy_object import LazyObject
+from .lazy_slot import LazySlot
 
 
 class Lazy:
@@ -116,7 +161,8 @@ class Lazy:
     def variable[T](
         cls: type[Self],
         *,
-        plural: Literal[False] = False
+        plural: Literal[False] = False,
+        memoization_mode: MemoizationMode = "content"
     ) -> Callable[[Callable[[], T]], LazyDescriptor[T, T]]: ...
 
     @overload
@@ -124,14 +170,16 @@ class Lazy:
     def variable[T](
         cls: type[Self],
         *,
-        plural: Literal[True]
+        plural: Literal[True],
+        memoization_mode: MemoizationMode = "content"
     ) -> Callable[[Callable[[], tuple[T, ...]]], LazyDescriptor[T, tuple[T, ...]]]: ...
 
     @classmethod
     def variable(
         cls: type[Self],
         *,
-        plural: bool = False
+        plural: bool = False,
+        memoization_mode: MemoizationMode = "content"
     ) -> Callable[[Callable], LazyDescriptor]:
 
         def result(
@@ -144,7 +192,8 @@ class Lazy:
                 plural=plural,
                 freeze=True,
                 deepcopy=False,
-                cache_capacity=1
+                cache_capacity=1,
+                memoization_mode=memoization_mode
             )
 
         return result
@@ -185,7 +234,8 @@ class Lazy:
                 plural=plural,
                 freeze=False,
                 deepcopy=deepcopy,
-                cache_capacity=0
+                cache_capacity=0,
+                memoization_mode="identity"
             )
 
         return result
@@ -196,7 +246,9 @@ class Lazy:
         cls: type[Self],
         *,
         plural: Literal[False] = False,
-        cache_capacity: int = 128
+        cache_capacity: int = 128,
+        memoization_mode: MemoizationMode = "content",
+        persist: bool = False
     ) -> Callable[[Callable[..., T]], LazyDescriptor[T, T]]: ...
 
     @overload
@@ -205,7 +257,9 @@ class Lazy:
         cls: type[Self],
         *,
         plural: Literal[True],
-        cache_capacity: int = 128
+        cache_capacity: int = 128,
+        memoization_mode: MemoizationMode = "content",
+        persist: bool = False
     ) -> Callable[[Callable[..., tuple[T, ...]]], LazyDescriptor[T, tuple[T, ...]]]: ...
 
     @classmethod
@@ -213,7 +267,9 @@ class Lazy:
         cls: type[Self],
         *,
         plural: bool = False,
-        cache_capacity: int = 128
+        cache_capacity: int = 128,
+        memoization_mode: MemoizationMode = "content",
+        persist: bool = False
     ) -> Callable[[Callable], LazyDescriptor]:
 
         def result(
@@ -226,7 +282,78 @@ class Lazy:
                 plural=plural,
                 freeze=True,
                 deepcopy=False,
-                cache_capacity=cache_capacity
+                cache_capacity=cache_capacity,
+                memoization_mode=memoization_mode,
+                persist=persist
             )
 
         return result
+
+    @classmethod
+    def _iter_descriptors(
+        cls: type[Self]
+    ) -> Iterator[LazyDescriptor]:
+        # Descriptors are defined in class namespaces. Classes with several lazy bases are reachable
+        # through each of them, so visited classes are skipped to yield each descriptor only once.
+        visited_classes: set[type[LazyObject]] = set()
+        lazy_object_classes: list[type[LazyObject]] = [LazyObject]
+        while lazy_object_classes:
+            lazy_object_cls = lazy_object_classes.pop()
+            if lazy_object_cls in visited_classes:
+                continue
+            visited_classes.add(lazy_object_cls)
+            lazy_object_classes.extend(lazy_object_cls.__subclasses__())
+            for descriptor in lazy_object_cls.__dict__.values():
+                if isinstance(descriptor, LazyDescriptor):
+                    yield descriptor
+
+    @classmethod
+    def stats(
+        cls: type[Self]
+    ) -> tuple[LazyStats, ...]:
+        # Sorted by compute time in descending order. Descriptors never accessed are omitted.
+        return tuple(sorted(
+            (
+                stats
+                for descriptor in cls._iter_descriptors()
+                if (stats := descriptor.get_stats()).hit_count
+                or stats.reuse_count
+                or stats.lru_hit_count
+                or stats.lru_miss_count
+                or stats.invalidation_count
+            ),
+            key=lambda stats: stats.compute_time,
+            reverse=True
+        ))
+
+    @classmethod
+    def reset_stats(
+        cls: type[Self]
+    ) -> None:
+        for descriptor in cls._iter_descriptors():
+            descriptor.reset_stats()
+
+    @classmethod
+    def clear_caches(
+        cls: type[Self]
+    ) -> None:
+        # Expired slots are emptied first, so that values dropped from caches can be released right away.
+        LazySlot.clear_expired()
+        LazyCache.clear_all()
+
+    @classmethod
+    def prefetch(
+        cls: type[Self],
+        lazy_objects: Iterable[LazyObject],
+        descriptors: Iterable[LazyDescriptor] | None = None
+    ) -> None:
+        # Descriptors are matched by names, so that overriding descriptors of subclasses are respected.
+        # All properties are prefetched if `descriptors` is not provided.
+        names = None if descriptors is None else frozenset(descriptor._name for descriptor in descriptors)
+        LazyDescriptor.prefetch(
+            (lazy_object, descriptor)
+            for lazy_object in lazy_objects
+            for descriptor in lazy_object._lazy_descriptors
+            if descriptor._is_property
+            and (names is None or descriptor._name in names)
+        )
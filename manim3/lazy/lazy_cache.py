@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+
+import sys
+import weakref
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Hashable,
+    Self
+)
+
+import attrs
+import moderngl
+import numpy as np
+from lru import LRU
+
+
+class LazyCache[KT: Hashable, VT]:
+    __slots__ = (
+        "__weakref__",
+        "_lru",
+        "_size",
+        "_release"
+    )
+
+    # The byte budget applied to each cache separately, on top of its entry capacity.
+    _size_limit: ClassVar[int] = 1 << 26
+    _caches: ClassVar[weakref.WeakSet[LazyCache]] = weakref.WeakSet()
+
+    # Driver-side sizes of programs are not queryable. A nominal estimate is taken.
+    _PROGRAM_SIZE: ClassVar[int] = 1 << 14
+
+    def __init__(
+        self: Self,
+        capacity: int,
+        release: Callable[[VT], None]
+    ) -> None:
+        super().__init__()
+        self._lru: LRU[KT, tuple[VT, int]] = LRU(capacity)
+        self._size: int = 0
+        # Invoked on each popped value, while the caller still holds it.
+        self._release: Callable[[VT], None] = release
+        type(self)._caches.add(self)
+
+    def _pop_least_recent(
+        self: Self
+    ) -> None:
+        # `LRU.popitem` leaks a reference to the popped value, so the entry is peeked and popped instead.
+        key = self._lru.peek_last_item()[0]
+        value, size = self._lru.pop(key)
+        self._size -= size
+        self._release(value)
+
+    def _trim(
+        self: Self
+    ) -> None:
+        # The most recent entry is always kept, even if it exceeds the budget alone.
+        while self._size > type(self)._size_limit and len(self._lru) > 1:
+            self._pop_least_recent()
+
+    @classmethod
+    def estimate_size(
+        cls: type[Self],
+        value: Any
+    ) -> int:
+        match value:
+            case np.ndarray():
+                return value.nbytes
+            case tuple():
+                return sum(cls.estimate_size(element) for element in value)
+            case moderngl.Buffer():
+                return value.size
+            case moderngl.Texture():
+                return value.width * value.height * value.components * int(value.dtype[1:]) * max(value.samples, 1)
+            case moderngl.Program():
+                return cls._PROGRAM_SIZE
+            case moderngl.VertexArray():
+                # Storages are owned by buffers, which are estimated on their own.
+                return 0
+            case _ if attrs.has(type(value)):
+                return sum(cls.estimate_size(field_value) for field_value in attrs.astuple(value, recurse=False))
+            case _:
+                # Other objects may report their resident sizes via `__sizeof__`.
+                return sys.getsizeof(value)
+
+    @classmethod
+    def release_unreferenced(
+        cls: type[Self],
+        value: Any,
+        owners_count: int
+    ) -> None:
+        # Releases gl objects within a value right away, instead of leaving them to the garbage collector.
+        # Objects referenced beyond `owners_count` references are skipped, as they are still in use elsewhere.
+        # The argument and the argument of `sys.getrefcount` account for the other 2 references.
+        # Pooled buffers are handed back to their pools as soon as the value is dropped.
+        if sys.getrefcount(value) > owners_count + 2:
+            return
+        match value:
+            case moderngl.Buffer() | moderngl.Texture() | moderngl.Program() | moderngl.VertexArray() | moderngl.Framebuffer():
+                value.release()
+            case tuple():
+                for element in value:
+                    # Referenced from the tuple and the loop variable.
+                    cls.release_unreferenced(element, 2)
+            case _ if attrs.has(type(value)):
+                for field_value in attrs.astuple(value, recurse=False):
+                    # Referenced from the instance, the field tuple and the loop variable.
+                    cls.release_unreferenced(field_value, 3)
+
+    @classmethod
+    def set_size_limit(
+        cls: type[Self],
+        size_limit: int
+    ) -> None:
+        cls._size_limit = size_limit
+        for cache in tuple(cls._caches):
+            cache._trim()
+
+    @classmethod
+    def get_total_size(
+        cls: type[Self]
+    ) -> int:
+        return sum(cache._size for cache in tuple(cls._caches))
+
+    @classmethod
+    def clear_all(
+        cls: type[Self]
+    ) -> None:
+        for cache in tuple(cls._caches):
+            cache.clear()
+
+    def get(
+        self: Self,
+        key: KT
+    ) -> VT | None:
+        if (entry := self._lru.get(key)) is None:
+            return None
+        value, _ = entry
+        return value
+
+    def set(
+        self: Self,
+        key: KT,
+        value: VT,
+        size: int
+    ) -> None:
+        lru = self._lru
+        if (entry := lru.pop(key, None)) is not None:
+            _, entry_size = entry
+            self._size -= entry_size
+        if len(lru) >= lru.get_size():
+            self._pop_least_recent()
+        lru[key] = (value, size)
+        self._size += size
+        self._trim()
+
+    def get_size(
+        self: Self
+    ) -> int:
+        return self._size
+
+    def clear(
+        self: Self
+    ) -> None:
+        while self._lru:
+            self._pop_least_recent()
@@ -1,24 +1,35 @@
 from __future__ import annotations
 
 
+import concurrent.futures
 import itertools
+import operator
+import os
+import sys
+import threading
+import time
 import weakref
 from typing import (
     TYPE_CHECKING,
+    Any,
     Callable,
     ClassVar,
     Hashable,
-    Iterator,
+    Iterable,
+    Literal,
     Never,
     Self,
     overload
 )
 
-from lru import LRU
+import attrs
+
+from .lazy_cache import LazyCache
+from .lazy_persistence import LazyPersistence
+from .lazy_slot import LazySlot
 
 if TYPE_CHECKING:
     from .lazy_object import LazyObject
-    from .lazy_slot import LazySlot
 
 
 class Memoized[T]:
@@ -63,43 +74,81 @@ class Memoization[KT: Hashable, VT](weakref.WeakValueDictionary[KT, Memoized[VT]
         return memoized_value
 
 
+type MemoizationMode = Literal["content", "digest", "identity"]
+
+
+@attrs.frozen(kw_only=True)
+class LazyStats:
+    name: str
+    hit_count: int  # Reads served by a valid slot.
+    reuse_count: int  # Reads served by expired elements with unchanged parameters.
+    lru_hit_count: int
+    lru_miss_count: int
+    call_count: int  # Invocations of the method. Differs from lru misses by persistent cache hits.
+    compute_time: float  # In seconds, spent in the method.
+    invalidation_count: int  # Expirations of property slots.
+    memoized_bytes: int  # Estimated bytes of elements currently held in the memoization.
+    cached_bytes: int  # Estimated bytes of elements currently held in the lru cache.
+
+
 type TupleTree[T] = T | tuple[TupleTree[T], ...]
 
 
-class Tree[T]:
+class ParameterStep:
     __slots__ = (
-        "_content",
-        "_children"
+        "_slot_getter",
+        "_plural",
+        "_next_step"
     )
 
     def __init__(
         self: Self,
-        content: T,
-        children: tuple[Tree[T], ...] | None = None
+        name: str,
+        plural: bool,
+        next_step: ParameterStep | None
     ) -> None:
         super().__init__()
-        self._content: T = content
-        self._children: tuple[Tree[T], ...] | None = children
-
-    def iter_leaves(
-        self: Self
-    ) -> Iterator[Tree[T]]:
-        if (children := self._children) is not None:
-            for child in children:
-                yield from child.iter_leaves()
-        else:
-            yield self
+        # Fetches the slot from `LazyObject._lazy_slots`.
+        # Descriptors are still fetched from slots, since they may be overridden in subclasses.
+        self._slot_getter: Callable[[object], LazySlot] = operator.attrgetter(name)
+        self._plural: bool = plural
+        self._next_step: ParameterStep | None = next_step
 
-    def as_tuple_tree[ConvertedT](
+    def resolve(
         self: Self,
-        func: Callable[[T], ConvertedT]
-    ) -> TupleTree[ConvertedT]:
-        if (children := self._children) is not None:
-            return tuple(
-                child.as_tuple_tree(func)
-                for child in children
+        lazy_object: LazyObject,
+        associated_slots: set[LazySlot]
+    ) -> tuple[TupleTree[int], TupleTree[Any]]:
+        # Resolves the remaining parameter chain from `lazy_object` in a single pass,
+        # producing the tuple tree of memoized ids (as the key) along with the tuple tree of values.
+        slot = self._slot_getter(lazy_object._lazy_slots)
+        descriptor = slot.get_descriptor()
+        memoized_elements = descriptor._get_slot_memoized_elements(lazy_object, slot)
+        if descriptor._is_property:
+            associated_slots.update(slot._variable_slots)
+        else:
+            associated_slots.add(slot)
+
+        if (next_step := self._next_step) is not None:
+            if not self._plural:
+                (memoized_element,) = memoized_elements
+                return next_step.resolve(memoized_element._value, associated_slots)
+            resolved_pairs = tuple(
+                next_step.resolve(memoized_element._value, associated_slots)
+                for memoized_element in memoized_elements
+            )
+            return (
+                tuple(key for key, _ in resolved_pairs),
+                tuple(value for _, value in resolved_pairs)
             )
-        return func(self._content)
+
+        if not self._plural:
+            (memoized_element,) = memoized_elements
+            return memoized_element._id, memoized_element._value
+        return (
+            tuple(memoized_element._id for memoized_element in memoized_elements),
+            tuple(memoized_element._value for memoized_element in memoized_elements)
+        )
 
 
 class LazyDescriptor[T, DataT]:
@@ -110,15 +159,32 @@ class LazyDescriptor[T, DataT]:
         "_plural",
         "_freeze",
         "_deepcopy",
+        "_persist",
+        "_memoization_mode",
         "_lru_cache",
         "_element_memoization",
         "_name",
         "_parameter_name_chains",
+        "_parameter_first_steps",
         "_decomposer",
         "_composer",
-        "_hasher"
+        "_hasher",
+        "_element_cls",
+        "_persistence_stamp",
+        "_qualname",
+        "_hit_count",
+        "_reuse_count",
+        "_lru_hit_count",
+        "_lru_miss_count",
+        "_call_count",
+        "_compute_time",
+        "_invalidation_count"
     )
 
+    # Held around lazy evaluation while worker threads of `prefetch` are running.
+    _prefetch_lock: ClassVar[threading.RLock | None] = None
+    _prefetch_executor: ClassVar[concurrent.futures.ThreadPoolExecutor | None] = None
+
     def __init__(
         self: Self,
         method: Callable[..., DataT],
@@ -126,7 +192,9 @@ class LazyDescriptor[T, DataT]:
         plural: bool,
         freeze: bool,
         deepcopy: bool,
-        cache_capacity: int
+        cache_capacity: int,
+        memoization_mode: MemoizationMode,
+        persist: bool = False
     ) -> None:
         super().__init__()
         self._method: Callable[..., DataT] = method
@@ -134,13 +202,23 @@ class LazyDescriptor[T, DataT]:
         self._plural: bool = plural
         self._freeze: bool = freeze
         self._deepcopy: bool = deepcopy
-        self._lru_cache: LRU[Hashable, tuple[Memoized[T], ...]] | None = LRU(cache_capacity) if cache_capacity else None
+        self._persist: bool = persist
+        self._memoization_mode: MemoizationMode = memoization_mode if freeze else "identity"
+        self._lru_cache: LazyCache[Hashable, tuple[Memoized[T], ...]] | None = LazyCache(
+            capacity=cache_capacity,
+            release=LazyDescriptor._release_memoized_elements
+        ) if cache_capacity else None
         self._element_memoization: Memoization[Hashable, T] = Memoization()
         self._name: str = NotImplemented
         self._parameter_name_chains: tuple[tuple[str, ...], ...] = NotImplemented
+        self._parameter_first_steps: tuple[ParameterStep, ...] = NotImplemented
         self._decomposer: Callable[[DataT], tuple[T, ...]] = NotImplemented
         self._composer: Callable[[tuple[T, ...]], DataT] = NotImplemented
         self._hasher: Callable[[T], Hashable] = NotImplemented
+        self._element_cls: type = NotImplemented
+        self._persistence_stamp: str | None = None
+        self._qualname: str = NotImplemented
+        self.reset_stats()
 
     @overload
     def __get__(
@@ -182,6 +260,10 @@ class LazyDescriptor[T, DataT]:
         self: Self,
         elements: tuple[T, ...]
     ) -> tuple[Memoized[T], ...]:
+        if not self._freeze:
+            # Elements of unfrozen descriptors never appear in parameter keys,
+            # so there is no need to look them up in the memoization.
+            return tuple(Memoized(element) for element in elements)
         element_memoization = self._element_memoization
         hasher = self._hasher
         return tuple(
@@ -189,46 +271,153 @@ class LazyDescriptor[T, DataT]:
             for element in elements
         )
 
+    def _invoke_method(
+        self: Self,
+        values: tuple[Any, ...]
+    ) -> tuple[tuple[T, ...], float]:
+        # Touches no state other than lazy data read within the method, so it may run on worker threads.
+        start_time = time.perf_counter()
+        elements = self._decomposer(self._method(*values))
+        return elements, time.perf_counter() - start_time
+
+    def _load_elements(
+        self: Self,
+        values: tuple[Any, ...]
+    ) -> tuple[str | None, tuple[T, ...] | None]:
+        if not self._persist:
+            return None, None
+        # Stamped on first use, when all globals the method refers to are defined.
+        if (persistence_stamp := self._persistence_stamp) is None:
+            persistence_stamp = self._persistence_stamp = LazyPersistence.get_stamp(
+                f"{self._method.__module__}.{self._qualname}", self._method
+            )
+        if (digest := LazyPersistence.get_digest(persistence_stamp, values)) is None:
+            return None, None
+        return digest, LazyPersistence.load(digest, self._element_cls)
+
+    def _store_elements(
+        self: Self,
+        digest: str | None,
+        elements: tuple[T, ...],
+        compute_time: float
+    ) -> None:
+        self._call_count += 1
+        self._compute_time += compute_time
+        if digest is not None:
+            LazyPersistence.save(digest, elements)
+
+    def _compute_elements(
+        self: Self,
+        values: tuple[Any, ...]
+    ) -> tuple[T, ...]:
+        digest, elements = self._load_elements(values)
+        if elements is None:
+            elements, compute_time = self._invoke_method(values)
+            self._store_elements(digest, elements, compute_time)
+        return elements
+
+    def _resolve_parameters(
+        self: Self,
+        instance: LazyObject
+    ) -> tuple[Hashable, tuple[Any, ...], set[LazySlot]]:
+        # If there's at least a parameter, the slot is guaranteed to be a property slot.
+        # It shall be associated with the returned variable slots.
+        associated_slots: set[LazySlot] = set()
+        resolved_pairs = tuple(
+            parameter_first_step.resolve(instance, associated_slots)
+            for parameter_first_step in self._parameter_first_steps
+        )
+        return (
+            tuple(key for key, _ in resolved_pairs),
+            tuple(value for _, value in resolved_pairs),
+            associated_slots
+        )
+
+    def _lookup_memoized_elements(
+        self: Self,
+        slot: LazySlot,
+        memoized_parameter_key: Hashable
+    ) -> tuple[Memoized[T], ...] | None:
+        # Parameters resolved to the same memoized elements as before expiration.
+        # Reuse the expired elements, so that results depending only on unchanged parameters
+        # keep their identities regardless of the lru cache capacity.
+        if (memoized_elements := slot.get_expired(memoized_parameter_key)) is not None:
+            self._reuse_count += 1
+            return memoized_elements
+        if (lru_cache := self._lru_cache) is not None and (memoized_elements := lru_cache.get(memoized_parameter_key)) is not None:
+            self._lru_hit_count += 1
+            return memoized_elements
+        self._lru_miss_count += 1
+        return None
+
+    @staticmethod
+    def _release_memoized_elements(
+        memoized_elements: tuple[Memoized[T], ...]
+    ) -> None:
+        # Called on elements dropped from the lru cache. Elements still held by a slot, including an expired one
+        # which may reuse them, are skipped. Beyond the caller, the argument and the argument of `sys.getrefcount`
+        # account for the references.
+        if sys.getrefcount(memoized_elements) > 3:
+            return
+        for memoized_element in memoized_elements:
+            # Referenced from the tuple, the loop variable and the argument of `sys.getrefcount`.
+            if sys.getrefcount(memoized_element) > 3:
+                continue
+            LazyCache.release_unreferenced(memoized_element._value, 1)
+
+    def _cache_memoized_elements(
+        self: Self,
+        memoized_parameter_key: Hashable,
+        memoized_elements: tuple[Memoized[T], ...]
+    ) -> None:
+        if (lru_cache := self._lru_cache) is None:
+            return
+        lru_cache.set(
+            key=memoized_parameter_key,
+            value=memoized_elements,
+            size=sum(
+                LazyCache.estimate_size(memoized_element._value)
+                for memoized_element in memoized_elements
+            )
+        )
+
     def _get_memoized_elements(
         self: Self,
         instance: LazyObject
     ) -> tuple[Memoized[T], ...]:
-        slot = self.get_slot(instance)
-        if (memoized_elements := slot.get()) is None:
-            # If there's at least a parameter, `slot` is guaranteed to be a property slot.
-            # Associate it with variable slots.
-            tree_root = Memoized(instance)
-            trees = tuple(Tree(tree_root) for _ in self._parameter_name_chains)
-            associated_slots: set[LazySlot] = set()
-            for parameter_name_chain, tree in zip(self._parameter_name_chains, trees, strict=True):
-                for name in parameter_name_chain:
-                    for leaf in tree.iter_leaves():
-                        leaf_object = leaf._content.get_value()
-                        leaf_slot = leaf_object._get_lazy_slot(name)
-                        descriptor = leaf_slot.get_descriptor()
-                        children_memoized_elements = descriptor._get_memoized_elements(leaf_object)
-                        if descriptor._plural:
-                            leaf._children = tuple(Tree(element) for element in children_memoized_elements)
-                        else:
-                            (leaf._content,) = children_memoized_elements
-                        if descriptor._is_property:
-                            associated_slots.update(leaf_slot.iter_associated_slots())
-                        else:
-                            associated_slots.add(leaf_slot)
-
-            memoized_parameter_key: Hashable = tuple(
-                tree.as_tuple_tree(Memoized.get_id) for tree in trees
-            )
-            if (lru_cache := self._lru_cache) is None or (memoized_elements := lru_cache.get(memoized_parameter_key)) is None:
-                memoized_elements = self._memoize_elements(self._decomposer(self._method(*(
-                    tree.as_tuple_tree(Memoized.get_value) for tree in trees
-                ))))
-                if lru_cache is not None:
-                    lru_cache[memoized_parameter_key] = memoized_elements
-            slot.set(
-                elements=memoized_elements,
-                associated_slots=associated_slots
-            )
+        return self._get_slot_memoized_elements(instance, self.get_slot(instance))
+
+    def _get_slot_memoized_elements(
+        self: Self,
+        instance: LazyObject,
+        slot: LazySlot
+    ) -> tuple[Memoized[T], ...]:
+        if (prefetch_lock := LazyDescriptor._prefetch_lock) is not None:
+            # Methods running on worker threads of `prefetch` may read lazy data.
+            with prefetch_lock:
+                return self._evaluate_slot(instance, slot)
+        return self._evaluate_slot(instance, slot)
+
+    def _evaluate_slot(
+        self: Self,
+        instance: LazyObject,
+        slot: LazySlot
+    ) -> tuple[Memoized[T], ...]:
+        if self._is_property and LazySlot._batched_variable_slots:
+            # Expire pending property slots before any of them is read.
+            LazySlot.flush_batch()
+        if (memoized_elements := slot.get()) is not None:
+            self._hit_count += 1
+            return memoized_elements
+        memoized_parameter_key, values, associated_slots = self._resolve_parameters(instance)
+        if (memoized_elements := self._lookup_memoized_elements(slot, memoized_parameter_key)) is None:
+            memoized_elements = self._memoize_elements(self._compute_elements(values))
+            self._cache_memoized_elements(memoized_parameter_key, memoized_elements)
+        slot.set(
+            elements=memoized_elements,
+            associated_slots=associated_slots,
+            parameter_key=memoized_parameter_key
+        )
         return memoized_elements
 
     def _set_memoized_elements(
@@ -239,13 +428,42 @@ class LazyDescriptor[T, DataT]:
         assert not self._is_property
         slot = self.get_slot(instance)
         # Guaranteed to be a variable slot. Expire associated property slots.
-        for expired_property_slot in slot.iter_associated_slots():
-            expired_property_slot.expire()
+        slot.expire_associated_slots()
         slot.set(
             elements=memoized_elements,
             associated_slots=set()
         )
 
+    def get_stats(
+        self: Self
+    ) -> LazyStats:
+        return LazyStats(
+            name=self._qualname,
+            hit_count=self._hit_count,
+            reuse_count=self._reuse_count,
+            lru_hit_count=self._lru_hit_count,
+            lru_miss_count=self._lru_miss_count,
+            call_count=self._call_count,
+            compute_time=self._compute_time,
+            invalidation_count=self._invalidation_count,
+            memoized_bytes=sum(
+                LazyCache.estimate_size(memoized_element._value)
+                for memoized_element in tuple(self._element_memoization.values())
+            ),
+            cached_bytes=lru_cache.get_size() if (lru_cache := self._lru_cache) is not None else 0
+        )
+
+    def reset_stats(
+        self: Self
+    ) -> None:
+        self._hit_count: int = 0
+        self._reuse_count: int = 0
+        self._lru_hit_count: int = 0
+        self._lru_miss_count: int = 0
+        self._call_count: int = 0
+        self._compute_time: float = 0.0
+        self._invalidation_count: int = 0
+
     def get_slot(
         self: Self,
         instance: LazyObject
@@ -264,3 +482,96 @@ class LazyDescriptor[T, DataT]:
         elements: tuple[T, ...]
     ) -> None:
         self._set_memoized_elements(instance, self._memoize_elements(elements))
+
+    def splice_elements(
+        self: Self,
+        instance: LazyObject,
+        start: int,
+        stop: int,
+        elements: tuple[T, ...]
+    ) -> None:
+        # Replaces elements within `[start, stop)` of a plural variable.
+        # Memoized elements outside the range are reused, so only the spliced elements are memoized.
+        assert self._plural
+        memoized_elements = self._get_memoized_elements(instance)
+        self._set_memoized_elements(instance, (
+            *memoized_elements[:start],
+            *self._memoize_elements(elements),
+            *memoized_elements[stop:]
+        ))
+
+    @classmethod
+    def prefetch(
+        cls: type[Self],
+        instance_descriptor_pairs: Iterable[tuple[LazyObject, LazyDescriptor]]
+    ) -> None:
+        # Parameters are resolved on the calling thread, where dependencies are evaluated as usual.
+        # Methods are then invoked on worker threads, once for each distinct pair of descriptor and parameters.
+        # Results are handed off into slots on the calling thread after all workers finish.
+        LazySlot.flush_batch()
+        pending: dict[tuple[LazyDescriptor, Hashable], tuple[tuple[Any, ...], list[tuple[LazySlot, set[LazySlot]]]]] = {}
+        for instance, descriptor in instance_descriptor_pairs:
+            assert descriptor._is_property
+            slot = descriptor.get_slot(instance)
+            if slot.get() is not None:
+                continue
+            memoized_parameter_key, values, associated_slots = descriptor._resolve_parameters(instance)
+            if (memoized_elements := descriptor._lookup_memoized_elements(slot, memoized_parameter_key)) is not None:
+                slot.set(
+                    elements=memoized_elements,
+                    associated_slots=associated_slots,
+                    parameter_key=memoized_parameter_key
+                )
+                continue
+            _, slot_items = pending.setdefault((descriptor, memoized_parameter_key), (values, []))
+            slot_items.append((slot, associated_slots))
+
+        jobs: list[tuple[LazyDescriptor, Hashable, str | None, tuple[Any, ...], list[tuple[LazySlot, set[LazySlot]]]]] = []
+        for (descriptor, memoized_parameter_key), (values, slot_items) in pending.items():
+            digest, elements = descriptor._load_elements(values)
+            if elements is None:
+                jobs.append((descriptor, memoized_parameter_key, digest, values, slot_items))
+                continue
+            memoized_elements = descriptor._memoize_elements(elements)
+            descriptor._cache_memoized_elements(memoized_parameter_key, memoized_elements)
+            for slot, associated_slots in slot_items:
+                if slot.get() is not None:
+                    continue
+                slot.set(
+                    elements=memoized_elements,
+                    associated_slots=associated_slots,
+                    parameter_key=memoized_parameter_key
+                )
+        if not jobs:
+            return
+
+        if (executor := cls._prefetch_executor) is None and (os.cpu_count() or 1) > 1:
+            executor = concurrent.futures.ThreadPoolExecutor(thread_name_prefix="lazy_prefetch")
+            cls._prefetch_executor = executor
+        if executor is None or len(jobs) == 1:
+            results = [descriptor._invoke_method(values) for descriptor, _, _, values, _ in jobs]
+        else:
+            futures: list[concurrent.futures.Future[tuple[tuple[Any, ...], float]]] = []
+            cls._prefetch_lock = threading.RLock()
+            try:
+                for descriptor, _, _, values, _ in jobs:
+                    futures.append(executor.submit(descriptor._invoke_method, values))
+            finally:
+                # Kept until all workers finish, even if some raise.
+                concurrent.futures.wait(futures)
+                cls._prefetch_lock = None
+            results = [future.result() for future in futures]
+
+        for (descriptor, memoized_parameter_key, digest, _, slot_items), (elements, compute_time) in zip(jobs, results, strict=True):
+            descriptor._store_elements(digest, elements, compute_time)
+            memoized_elements = descriptor._memoize_elements(elements)
+            descriptor._cache_memoized_elements(memoized_parameter_key, memoized_elements)
+            for slot, associated_slots in slot_items:
+                # The slot may have been listed twice, or evaluated from a method on a worker thread.
+                if slot.get() is not None:
+                    continue
+                slot.set(
+                    elements=memoized_elements,
+                    associated_slots=associated_slots,
+                    parameter_key=memoized_parameter_key
+                )
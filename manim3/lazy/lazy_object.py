@@ -2,15 +2,17 @@ from __future__ import annotations
 
 
 import copy
-import functools
+import hashlib
 import inspect
 from abc import ABC
+from contextlib import contextmanager
 from enum import Enum
 from typing import (
     Any,
     Callable,
     ClassVar,
     Hashable,
+    Iterator,
     Never,
     Self,
     TypeAliasType,
@@ -20,8 +22,14 @@ from typing import (
 import attrs
 import numpy as np
 
-from .lazy_descriptor import LazyDescriptor
-from .lazy_slot import LazySlot
+from .lazy_descriptor import (
+    LazyDescriptor,
+    ParameterStep
+)
+from .lazy_slot import (
+    LazySlot,
+    LazySlots
+)
 
 
 @attrs.frozen(kw_only=True)
@@ -108,7 +116,7 @@ class LazyObject(ABC):
 
     _lazy_descriptors: tuple[LazyDescriptor, ...] = ()
     _annotated_lazy_descriptors: dict[str, tuple[AnnotationRecord, LazyDescriptor]] = {}
-    _lazy_slots_cls: ClassVar[type] = object
+    _lazy_slots_cls: ClassVar[type[LazySlots]] = LazySlots
     _slot_names: ClassVar[tuple[str, ...]] = ()
 
     def __init_subclass__(
@@ -155,10 +163,16 @@ class LazyObject(ABC):
             descriptor._parameter_name_chains = parameter_name_chains
             assert descriptor._is_property or not parameter_name_chains
 
+            descriptor._element_cls = element_annotation_cls
+            descriptor._qualname = f"{cls.__qualname__}.{name}"
             descriptor._decomposer = Implementations.decomposers.fetch(descriptor._plural)
             descriptor._composer = Implementations.composers.fetch(descriptor._plural)
+            memoization_mode = descriptor._memoization_mode
+            hasher_cls = element_annotation_cls if memoization_mode != "identity" else object
             descriptor._hasher = (
-                Implementations.hashers.fetch(element_annotation_cls if descriptor._freeze else object)
+                Implementations.digest_hashers.fetch(hasher_cls)
+                if memoization_mode == "digest" and issubclass(hasher_cls, np.ndarray)
+                else Implementations.hashers.fetch(hasher_cls)
             )
 
             if (typed_overridden_descriptor := annotated_lazy_descriptors.get(name)) is not None:
@@ -174,16 +188,19 @@ class LazyObject(ABC):
                 type_params_cls=cls
             ), descriptor)
 
+            parameter_first_steps: list[ParameterStep] = []
             for parameter_name_chain, parameter in zip(
                 parameter_name_chains, signature.parameters.values(), strict=True
             ):
                 last_descriptor_freeze: bool = False
                 annotation_record = root_annotation_record
                 provided_annotation = parameter.annotation
+                plurals: list[bool] = []
                 for name_segment in parameter_name_chain:
                     assert issubclass(element_cls := annotation_record.annotation_cls, LazyObject)
                     parameter_annotation_record, parameter_descriptor = element_cls._annotated_lazy_descriptors[name_segment]
                     last_descriptor_freeze = parameter_descriptor._freeze
+                    plurals.append(parameter_descriptor._plural)
                     annotation_record = parameter_annotation_record.specialize(annotation_record)
                     provided_annotation = AnnotationRecord.extract_element_annotation(
                         annotation=provided_annotation,
@@ -194,16 +211,27 @@ class LazyObject(ABC):
                 assert parameter.kind is inspect.Parameter.POSITIONAL_OR_KEYWORD
                 assert parameter.default is inspect.Parameter.empty
 
+                # Compile the chain into linked steps. Overriding descriptors share the `plural` flag,
+                # so the shape of the resolved tuple tree is known ahead of time.
+                parameter_step: ParameterStep | None = None
+                for name_segment, plural in reversed(tuple(zip(parameter_name_chain, plurals, strict=True))):
+                    parameter_step = ParameterStep(
+                        name=name_segment,
+                        plural=plural,
+                        next_step=parameter_step
+                    )
+                assert parameter_step is not None
+                parameter_first_steps.append(parameter_step)
+            descriptor._parameter_first_steps = tuple(parameter_first_steps)
+
         cls._lazy_descriptors = tuple(descriptor for _, descriptor in annotated_lazy_descriptors.values())
-        cls._lazy_slots_cls = attrs.make_class(
-            name=f"__{cls.__name__}",
-            attrs={
-                name: attrs.field(factory=functools.partial(LazySlot, descriptor))
+        cls._lazy_slots_cls = type(f"__{cls.__name__}", (LazySlots,), {
+            "__slots__": tuple(annotated_lazy_descriptors),
+            "_descriptors": {
+                name: descriptor
                 for name, (_, descriptor) in annotated_lazy_descriptors.items()
-            },
-            slots=True,
-            frozen=True
-        )
+            }
+        })
         cls._slot_names = tuple(
             slot_name
             for base in reversed(cls.__mro__)
@@ -217,7 +245,7 @@ class LazyObject(ABC):
         self: Self
     ) -> None:
         super().__init__()
-        self._lazy_slots: object = type(self)._lazy_slots_cls()
+        self._lazy_slots: LazySlots = type(self)._lazy_slots_cls()
 
     def __copy__(
         self: Self
@@ -228,7 +256,7 @@ class LazyObject(ABC):
         self: Self,
         name: str
     ) -> LazySlot:
-        return self._lazy_slots.__getattribute__(name)
+        return getattr(self._lazy_slots, name)
 
     def copy(
         self: Self
@@ -241,12 +269,25 @@ class LazyObject(ABC):
         for descriptor in cls._lazy_descriptors:
             if descriptor._is_property:
                 continue
-            elements = descriptor.get_elements(self)
-            if descriptor._deepcopy:
-                elements = tuple(copy.copy(element) for element in elements)
+            if not descriptor._deepcopy:
+                # Memoized elements are immutable and can be shared directly, without being hashed again.
+                # A later write on either object simply rebinds its own slot.
+                descriptor._set_memoized_elements(result, descriptor._get_memoized_elements(self))
+                continue
+            elements = tuple(copy.copy(element) for element in descriptor.get_elements(self))
             descriptor.set_elements(result, elements)
         return result
 
+    @classmethod
+    @contextmanager
+    def batch(
+        cls: type[Self]
+    ) -> Iterator[None]:
+        # Writes within the context defer invalidation of dependent properties,
+        # which are expired in a single deduplicated pass on exit or before any property is read.
+        with LazySlot.batch():
+            yield
+
 
 class ImplementationRegistry[K: Hashable, V]:
     __slots__ = (
@@ -291,6 +332,7 @@ class Implementations:
     decomposers: ClassVar[ImplementationRegistry[bool, Callable[[Any], tuple[Any, ...]]]] = ImplementationRegistry(bool.__eq__)
     composers: ClassVar[ImplementationRegistry[bool, Callable[[tuple[Any, ...]], Any]]] = ImplementationRegistry(bool.__eq__)
     hashers: ClassVar[ImplementationRegistry[type, Callable[[Any], Hashable]]] = ImplementationRegistry(issubclass)
+    digest_hashers: ClassVar[ImplementationRegistry[type, Callable[[Any], Hashable]]] = ImplementationRegistry(issubclass)
 
     def __new__(
         cls: type[Self]
@@ -347,6 +389,14 @@ class Implementations:
     ) -> Hashable:
         return (element.shape, element.dtype, element.tobytes())
 
+    @digest_hashers.register(np.ndarray)
+    @staticmethod
+    def _(
+        element: np.ndarray
+    ) -> Hashable:
+        # Keys of a fixed size, so that the memoization does not hold a serialized copy of every array.
+        return (element.shape, element.dtype, hashlib.blake2b(np.ascontiguousarray(element), digest_size=16).digest())
+
     @hashers.register(object)
     @staticmethod
     def _(
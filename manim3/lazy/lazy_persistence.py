@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+
+import hashlib
+import importlib.metadata
+import os
+import pathlib
+import sys
+import types
+from enum import Enum
+from typing import (
+    Any,
+    Callable,
+    ClassVar,
+    Iterator,
+    Never,
+    Self
+)
+
+import attrs
+import numpy as np
+
+
+class LazyPersistence:
+    __slots__ = ()
+
+    # Bump whenever the storage format changes. Entries stamped with other versions are never matched.
+    _VERSION: ClassVar[int] = 1
+
+    _storage_dir: ClassVar[pathlib.Path | None] = None
+    _size_limit: ClassVar[int] = 0
+    _size: ClassVar[int] = 0
+
+    def __new__(
+        cls: type[Self]
+    ) -> Never:
+        raise TypeError
+
+    @classmethod
+    def _update_digest(
+        cls: type[Self],
+        hasher: hashlib.blake2b,
+        value: Any
+    ) -> bool:
+        # Only values whose contents are stable across runs can be digested.
+        match value:
+            case np.ndarray():
+                hasher.update(f"a{value.shape}{value.dtype.str}".encode())
+                hasher.update(np.ascontiguousarray(value))
+            case tuple():
+                hasher.update(f"t{len(value)}".encode())
+                return all(cls._update_digest(hasher, element) for element in value)
+            case bool() | int() | float() | str() | None | Enum():
+                hasher.update(f"{type(value).__name__}{value!r}".encode())
+            case _ if (lazy_descriptors := getattr(type(value), "_lazy_descriptors", None)) is not None:
+                # A lazy object is digested by contents of its variables. Unfrozen data is not supported.
+                hasher.update(f"l{type(value).__qualname__}".encode())
+                return all(
+                    descriptor._freeze and cls._update_digest(hasher, descriptor.get_elements(value))
+                    for descriptor in lazy_descriptors
+                    if not descriptor._is_property
+                )
+            case _ if attrs.has(type(value)):
+                hasher.update(f"c{type(value).__qualname__}".encode())
+                return all(
+                    cls._update_digest(hasher, field_value)
+                    for field_value in attrs.astuple(value, recurse=False)
+                )
+            case _:
+                return False
+        return True
+
+    @classmethod
+    def _update_code_digest(
+        cls: type[Self],
+        hasher: hashlib.blake2b,
+        code: types.CodeType
+    ) -> None:
+        # Nested code objects are digested recursively, as their representations contain addresses.
+        hasher.update(code.co_code)
+        hasher.update(f"{code.co_names}".encode())
+        for const in code.co_consts:
+            if isinstance(const, types.CodeType):
+                cls._update_code_digest(hasher, const)
+            else:
+                hasher.update(f"{const!r}".encode())
+
+    @classmethod
+    def _iter_code_names(
+        cls: type[Self],
+        code: types.CodeType
+    ) -> Iterator[str]:
+        yield from code.co_names
+        for const in code.co_consts:
+            if isinstance(const, types.CodeType):
+                yield from cls._iter_code_names(const)
+
+    @classmethod
+    def _get_dependency_module_names(
+        cls: type[Self],
+        method: Callable
+    ) -> set[str]:
+        # Modules defining the method, and the globals it refers to, including bases of classes.
+        module_names = {method.__module__}
+        method_globals = getattr(method, "__globals__", {})
+        for name in cls._iter_code_names(method.__code__):
+            match method_globals.get(name):
+                case types.ModuleType() as module:
+                    module_names.add(module.__name__)
+                case type() as global_cls:
+                    module_names.update(base.__module__ for base in global_cls.__mro__)
+                case global_value if isinstance(module_name := getattr(global_value, "__module__", None), str):
+                    module_names.add(module_name)
+        return module_names
+
+    @classmethod
+    def _get_package_version(
+        cls: type[Self],
+        package_name: str
+    ) -> str | None:
+        # Distributions are assumed to be named after their packages, as scanning all of them is slow.
+        try:
+            return importlib.metadata.version(package_name)
+        except importlib.metadata.PackageNotFoundError:
+            return getattr(sys.modules.get(package_name), "__version__", None)
+
+    @classmethod
+    def _update_dependency_digest(
+        cls: type[Self],
+        hasher: hashlib.blake2b,
+        method: Callable
+    ) -> None:
+        # Sources of manim3 modules involved are digested, along with versions of packages they import,
+        # so that entries are not matched once helpers are edited or libraries are upgraded.
+        # Packages without versions, like the standard library, are skipped.
+        package_names = {"manim3", "numpy"}
+        for module_name in sorted(cls._get_dependency_module_names(method)):
+            package_name = module_name.partition(".")[0]
+            if package_name != "manim3" or (module := sys.modules.get(module_name)) is None:
+                package_names.add(package_name)
+                continue
+            if (module_file := getattr(module, "__file__", None)) is not None:
+                hasher.update(module_name.encode())
+                hasher.update(pathlib.Path(module_file).read_bytes())
+            package_names.update(
+                module_global.__name__.partition(".")[0]
+                for module_global in vars(module).values()
+                if isinstance(module_global, types.ModuleType)
+            )
+        for package_name in sorted(package_names):
+            hasher.update(f"{package_name}=={cls._get_package_version(package_name)}".encode())
+
+    @classmethod
+    def _get_path(
+        cls: type[Self],
+        storage_dir: pathlib.Path,
+        digest: str
+    ) -> pathlib.Path | None:
+        for suffix in (".npy", ".npz"):
+            if (path := storage_dir.joinpath(f"{digest}{suffix}")).exists():
+                return path
+        return None
+
+    @classmethod
+    def _evict(
+        cls: type[Self],
+        storage_dir: pathlib.Path
+    ) -> None:
+        # Remove least recently used entries. Reading an entry refreshes its modification time.
+        # Entries may be removed concurrently by other processes sharing the storage.
+        entries: list[tuple[float, int, pathlib.Path]] = []
+        for entry in storage_dir.iterdir():
+            if entry.suffix not in (".npy", ".npz"):
+                continue
+            try:
+                entry_stat = entry.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((entry_stat.st_mtime, entry_stat.st_size, entry))
+        entries.sort()
+        size = sum(entry_size for _, entry_size, _ in entries)
+        for _, entry_size, entry in entries:
+            if size <= cls._size_limit:
+                break
+            try:
+                entry.unlink(missing_ok=True)
+            except OSError:
+                # Possibly still memory-mapped.
+                continue
+            size -= entry_size
+        cls._size = size
+
+    @classmethod
+    def enable(
+        cls: type[Self],
+        storage_dir: pathlib.Path,
+        size_limit: int
+    ) -> None:
+        storage_dir.mkdir(parents=True, exist_ok=True)
+        cls._storage_dir = storage_dir
+        cls._size_limit = size_limit
+        cls._evict(storage_dir)
+
+    @classmethod
+    def disable(
+        cls: type[Self]
+    ) -> None:
+        cls._storage_dir = None
+
+    @classmethod
+    def get_stamp(
+        cls: type[Self],
+        qualname: str,
+        method: Callable
+    ) -> str:
+        # Entries computed by an edited method, or with edited dependencies, are never matched.
+        hasher = hashlib.blake2b(qualname.encode(), digest_size=16)
+        cls._update_code_digest(hasher, method.__code__)
+        cls._update_dependency_digest(hasher, method)
+        return hasher.hexdigest()
+
+    @classmethod
+    def get_digest(
+        cls: type[Self],
+        stamp: str,
+        values: tuple[Any, ...]
+    ) -> str | None:
+        if cls._storage_dir is None:
+            return None
+        hasher = hashlib.blake2b(f"{cls._VERSION}:{stamp}".encode(), digest_size=16)
+        if not cls._update_digest(hasher, values):
+            return None
+        return hasher.hexdigest()
+
+    @classmethod
+    def load(
+        cls: type[Self],
+        digest: str,
+        element_cls: type
+    ) -> tuple[Any, ...] | None:
+        if (storage_dir := cls._storage_dir) is None or (path := cls._get_path(storage_dir, digest)) is None:
+            return None
+        try:
+            if path.suffix == ".npy":
+                # Mapped read-only, in accordance with frozen data.
+                elements = (np.load(path, mmap_mode="r"),)
+            else:
+                with np.load(path) as npz_file:
+                    elements = tuple(
+                        npz_file[f"{index}"]
+                        if not attrs.has(element_cls)
+                        else element_cls(**{
+                            field.name: npz_file[f"{index}.{field.name}"]
+                            for field in attrs.fields(element_cls)
+                        })
+                        for index in range(int(npz_file["count"]))
+                    )
+        except (OSError, ValueError, KeyError):
+            # Corrupted or incompatible entry. Treated as a miss, and overwritten later.
+            return None
+        os.utime(path)
+        return elements
+
+    @classmethod
+    def save(
+        cls: type[Self],
+        digest: str,
+        elements: tuple[Any, ...]
+    ) -> None:
+        if (storage_dir := cls._storage_dir) is None:
+            return
+        arrays: dict[str, np.ndarray] = {"count": np.array(len(elements))}
+        for index, element in enumerate(elements):
+            if isinstance(element, np.ndarray):
+                arrays[f"{index}"] = element
+            elif attrs.has(type(element)) and all(
+                isinstance(getattr(element, field.name), np.ndarray)
+                for field in attrs.fields(type(element))
+            ):
+                arrays.update(
+                    (f"{index}.{field.name}", getattr(element, field.name))
+                    for field in attrs.fields(type(element))
+                )
+            else:
+                return
+
+        # A single array is stored as `.npy`, which is memory-mapped when loading.
+        # Written to a temporary file first, so that interrupted writes never leave partial entries.
+        if len(elements) == 1 and isinstance(element := elements[0], np.ndarray):
+            path = storage_dir.joinpath(f"{digest}.npy")
+            temp_path = storage_dir.joinpath(f"{digest}.npy.tmp")
+            with temp_path.open("wb") as temp_file:
+                np.save(temp_file, element)
+        else:
+            path = storage_dir.joinpath(f"{digest}.npz")
+            temp_path = storage_dir.joinpath(f"{digest}.npz.tmp")
+            with temp_path.open("wb") as temp_file:
+                np.savez(temp_file, **arrays)
+        os.replace(temp_path, path)
+
+        cls._size += path.stat().st_size
+        if cls._size > cls._size_limit:
+            cls._evict(storage_dir)
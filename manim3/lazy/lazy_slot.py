@@ -2,8 +2,11 @@ from __future__ import annotations
 
 
 import weakref
+from contextlib import contextmanager
 from typing import (
     TYPE_CHECKING,
+    ClassVar,
+    Hashable,
     Iterator,
     Self
 )
@@ -18,51 +21,202 @@ if TYPE_CHECKING:
 class LazySlot[T, DataT]:
     __slots__ = (
         "__weakref__",
-        "_descriptor_ref",
+        "_descriptor",
         "_elements",
-        "_associated_slots"
+        "_expired",
+        "_parameter_key",
+        "_variable_slots",
+        "_property_slot_refs",
+        "_property_slot_refs_prune_size"
     )
 
+    # Variable slots written within a batch, whose associated property slots are pending expiration.
+    _batch_depth: ClassVar[int] = 0
+    _batched_variable_slots: ClassVar[set[LazySlot]] = set()
+    # Expired slots retaining elements, emptied by `clear_expired`. References of collected slots
+    # and slots set since are pruned whenever the set doubles in size.
+    _expired_slot_refs: ClassVar[set[weakref.ref[LazySlot]]] = set()
+    _expired_slot_refs_prune_size: ClassVar[int] = 16
+
     def __init__(
         self: Self,
         descriptor: LazyDescriptor[T, DataT]
     ) -> None:
         super().__init__()
-        self._descriptor_ref: weakref.ref[LazyDescriptor[T, DataT]] = weakref.ref(descriptor)
+        # Descriptors live as long as their classes. A strong reference is held directly.
+        self._descriptor: LazyDescriptor[T, DataT] = descriptor
         self._elements: tuple[Memoized[T], ...] | None = None
-        self._associated_slots: weakref.WeakSet[LazySlot] = weakref.WeakSet()
+        self._expired: bool = True
+        # The memoized parameter key from which `_elements` is computed. Only used by property slots.
+        # An expired property slot retains its elements, so that a recomputation resolving
+        # the same parameters can reuse them without consulting the lru cache.
+        self._parameter_key: Hashable = None
+        # Edges between slots are stored asymmetrically. A property slot holds its associated
+        # variable slots strongly, while a variable slot holds weak references to its associated
+        # property slots, allocated on the first association. References of collected property slots
+        # are pruned whenever the set doubles in size, instead of registering a callback per edge.
+        self._variable_slots: tuple[LazySlot, ...] = ()
+        self._property_slot_refs: set[weakref.ref[LazySlot]] | None = None
+        self._property_slot_refs_prune_size: int = 16
 
     def get_descriptor(
         self: Self
     ) -> LazyDescriptor[T, DataT]:
-        assert (descriptor := self._descriptor_ref()) is not None
-        return descriptor
+        return self._descriptor
+
+    def get_variable_slots(
+        self: Self
+    ) -> tuple[LazySlot, ...]:
+        return self._variable_slots
 
     def get(
         self: Self
     ) -> tuple[Memoized[T], ...] | None:
+        if self._expired:
+            return None
+        return self._elements
+
+    def get_expired(
+        self: Self,
+        parameter_key: Hashable
+    ) -> tuple[Memoized[T], ...] | None:
+        if not self._expired or self._parameter_key != parameter_key:
+            return None
         return self._elements
 
     def set(
         self: Self,
         elements: tuple[Memoized[T], ...],
-        associated_slots: set[LazySlot]
+        associated_slots: set[LazySlot],
+        parameter_key: Hashable = None
     ) -> None:
         self._elements = elements
-        assert not self._associated_slots
-        self._associated_slots.update(associated_slots)
+        self._expired = False
+        self._parameter_key = parameter_key
+        if not associated_slots:
+            return
+        assert not self._variable_slots
+        self._variable_slots = tuple(associated_slots)
+        # `weakref.ref` without a callback returns the same reference object for each call.
+        ref = weakref.ref(self)
         for slot in associated_slots:
-            slot._associated_slots.add(self)
+            if (property_slot_refs := slot._property_slot_refs) is None:
+                property_slot_refs = set()
+                slot._property_slot_refs = property_slot_refs
+            property_slot_refs.add(ref)
+            if len(property_slot_refs) > slot._property_slot_refs_prune_size:
+                property_slot_refs.difference_update([
+                    property_slot_ref
+                    for property_slot_ref in property_slot_refs
+                    if property_slot_ref() is None
+                ])
+                slot._property_slot_refs_prune_size = max(2 * len(property_slot_refs), 16)
 
     def expire(
         self: Self
     ) -> None:
-        self._elements = None
-        for slot in self._associated_slots:
-            slot._associated_slots.remove(self)
-        self._associated_slots.clear()
+        self._descriptor._invalidation_count += 1
+        self._expired = True
+        ref = weakref.ref(self)
+        if self._elements is not None:
+            expired_slot_refs = type(self)._expired_slot_refs
+            expired_slot_refs.add(ref)
+            if len(expired_slot_refs) > type(self)._expired_slot_refs_prune_size:
+                expired_slot_refs.difference_update([
+                    expired_slot_ref
+                    for expired_slot_ref in expired_slot_refs
+                    if (expired_slot := expired_slot_ref()) is None
+                    or not expired_slot._expired
+                ])
+                type(self)._expired_slot_refs_prune_size = max(2 * len(expired_slot_refs), 16)
+        if not (variable_slots := self._variable_slots):
+            return
+        for slot in variable_slots:
+            assert (property_slot_refs := slot._property_slot_refs) is not None
+            property_slot_refs.discard(ref)
+        self._variable_slots = ()
 
     def iter_associated_slots(
         self: Self
     ) -> Iterator[LazySlot]:
-        return iter(set(self._associated_slots))
+        # Called on variable slots.
+        if (property_slot_refs := self._property_slot_refs) is None:
+            return iter(())
+        return (
+            slot
+            for property_slot_ref in tuple(property_slot_refs)
+            if (slot := property_slot_ref()) is not None
+        )
+
+    def expire_associated_slots(
+        self: Self
+    ) -> None:
+        # Called on variable slots. Within a batch, the expiration is deferred until flushed,
+        # so that property slots shared by multiple writes are expired only once.
+        if not self._property_slot_refs:
+            return
+        if type(self)._batch_depth:
+            type(self)._batched_variable_slots.add(self)
+            return
+        for slot in self.iter_associated_slots():
+            slot.expire()
+
+    @classmethod
+    def flush_batch(
+        cls: type[Self]
+    ) -> None:
+        if not (batched_variable_slots := cls._batched_variable_slots):
+            return
+        cls._batched_variable_slots = set()
+        expired_slots: set[LazySlot] = set()
+        for variable_slot in batched_variable_slots:
+            expired_slots.update(variable_slot.iter_associated_slots())
+        for slot in expired_slots:
+            slot.expire()
+
+    @classmethod
+    def clear_expired(
+        cls: type[Self]
+    ) -> None:
+        # Drops elements retained by expired slots, which may otherwise keep values alive
+        # long after they are evicted from lru caches.
+        expired_slot_refs = cls._expired_slot_refs
+        cls._expired_slot_refs = set()
+        cls._expired_slot_refs_prune_size = 16
+        for expired_slot_ref in expired_slot_refs:
+            if (expired_slot := expired_slot_ref()) is None or not expired_slot._expired:
+                continue
+            expired_slot._elements = None
+            expired_slot._parameter_key = None
+
+    @classmethod
+    @contextmanager
+    def batch(
+        cls: type[Self]
+    ) -> Iterator[None]:
+        cls._batch_depth += 1
+        try:
+            yield
+        finally:
+            cls._batch_depth -= 1
+            if not cls._batch_depth:
+                cls.flush_batch()
+
+
+class LazySlots:
+    __slots__ = ()
+
+    # Each lazy object class derives a container, with a member for each descriptor name.
+    # Members are left unassigned until first accessed, so that slots are only created on demand.
+    _descriptors: ClassVar[dict[str, LazyDescriptor]] = {}
+
+    def __getattr__(
+        self: Self,
+        name: str
+    ) -> LazySlot:
+        # Only invoked for unassigned members.
+        if (descriptor := type(self)._descriptors.get(name)) is None:
+            raise AttributeError(name)
+        slot = LazySlot(descriptor)
+        self.__setattr__(name, slot)
+        return slot
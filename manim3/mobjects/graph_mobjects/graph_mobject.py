@@ -6,6 +6,8 @@ from typing import (
     Self
 )
 
+import numpy as np
+
 from ...animatables.animatable.animatable import Animatable
 from ...animatables.arrays.animatable_color import AnimatableColor
 from ...animatables.arrays.animatable_float import AnimatableFloat
@@ -80,6 +82,24 @@ class GraphMobject(Mobject):
     ) -> NP_x3f8:
         return graph__positions[graph__edges.flatten()]
 
+    @Lazy.property()
+    @staticmethod
+    def _translucent_(
+        opacity__array: NP_f8
+    ) -> bool:
+        return bool(opacity__array < 1.0)
+
+    @Lazy.property()
+    @staticmethod
+    def _render_bounds_(
+        world_bounds: NP_x3f8,
+        thickness__array: NP_f8
+    ) -> NP_x3f8:
+        # Strokes extend beyond edges by half of the thickness.
+        if not len(world_bounds):
+            return world_bounds
+        return world_bounds + np.array(((1.0,), (-1.0,))) * thickness__array / 2.0
+
     @Lazy.property()
     @staticmethod
     def _graph_uniform_block_buffer_(
@@ -122,26 +142,37 @@ class GraphMobject(Mobject):
             vertices_count=len(graph__positions)
         )
 
-    @Lazy.property()
+    @Lazy.property(plural=True)
     @staticmethod
-    def _graph_vertex_array_(
+    def _graph_uniform_block_buffers_(
         camera__camera_uniform_block_buffer: UniformBlockBuffer,
         model_uniform_block_buffer: UniformBlockBuffer,
-        graph_uniform_block_buffer: UniformBlockBuffer,
+        graph_uniform_block_buffer: UniformBlockBuffer
+    ) -> tuple[UniformBlockBuffer, ...]:
+        return (
+            camera__camera_uniform_block_buffer,
+            model_uniform_block_buffer,
+            graph_uniform_block_buffer
+        )
+
+    @Lazy.property()
+    @staticmethod
+    def _graph_vertex_array_(
+        translucent: bool,
+        graph_uniform_block_buffers__layout: tuple[UniformBlockBuffer, ...],
         graph_attributes_buffer: AttributesBuffer
     ) -> VertexArray:
         return VertexArray(
             shader_filename="graph.glsl",
-            uniform_block_buffers=(
-                camera__camera_uniform_block_buffer,
-                model_uniform_block_buffer,
-                graph_uniform_block_buffer
+            custom_macros=() if translucent else (
+                "#define OPAQUE",
             ),
+            uniform_block_buffers=graph_uniform_block_buffers__layout,
             attributes_buffer=graph_attributes_buffer
         )
 
     def _iter_vertex_arrays(
         self: Self
-    ) -> Iterator[VertexArray]:
+    ) -> Iterator[tuple[VertexArray, tuple[UniformBlockBuffer, ...]]]:
         yield from super()._iter_vertex_arrays()
-        yield self._graph_vertex_array_
+        yield self._graph_vertex_array_, self._graph_uniform_block_buffers_
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+
+import itertools
+from typing import Self
+
+import numpy as np
+
+from ...constants.custom_typing import (
+    NP_f8,
+    NP_x3f8,
+    NP_x44f8,
+    NP_xf8
+)
+from ...lazy.lazy import Lazy
+from ...rendering.buffers.attributes_buffer import AttributesBuffer
+from ...rendering.buffers.texture_buffer import TextureBuffer
+from ...rendering.buffers.uniform_block_buffer import UniformBlockBuffer
+from ...rendering.mgl_enums import PrimitiveMode
+from ...rendering.vertex_array import VertexArray
+from .mesh_mobject import MeshMobject
+
+
+class InstancedMeshMobject(MeshMobject):
+    __slots__ = ()
+
+    # Renders `count` instances of a template in a single draw call.
+    # The geometry and the material of the template are shared by all instances,
+    # while each instance carries its own model matrix, color and opacity.
+    # Instance model matrices are applied before the model matrix of this mobject,
+    # and instance colors and opacities multiply those of the material.
+
+    def __init__(
+        self: Self,
+        template: MeshMobject,
+        count: int
+    ) -> None:
+        super().__init__(template._mesh_.copy())
+        self._model_matrix_ = template._model_matrix_.copy()
+        self._color_ = template._color_.copy()
+        self._opacity_ = template._opacity_.copy()
+        self._weight_ = template._weight_.copy()
+        self._ambient_strength_ = template._ambient_strength_.copy()
+        self._specular_strength_ = template._specular_strength_.copy()
+        self._shininess_ = template._shininess_.copy()
+        self._color_maps_ = template._color_maps_
+        self._camera_ = template._camera_
+        self._lighting_ = template._lighting_
+        self._instance_model_matrices_ = np.repeat(np.identity(4)[None], count, axis=0)
+        self._instance_colors_ = np.ones((count, 3))
+        self._instance_opacities_ = np.ones((count,))
+
+    @Lazy.variable(memoization_mode="digest")
+    @staticmethod
+    def _instance_model_matrices_() -> NP_x44f8:
+        return np.zeros((0, 4, 4))
+
+    @Lazy.variable(memoization_mode="digest")
+    @staticmethod
+    def _instance_colors_() -> NP_x3f8:
+        return np.zeros((0, 3))
+
+    @Lazy.variable(memoization_mode="digest")
+    @staticmethod
+    def _instance_opacities_() -> NP_xf8:
+        return np.zeros((0,))
+
+    @Lazy.property()
+    @staticmethod
+    def _local_sample_positions_(
+        mesh__positions: NP_x3f8,
+        instance_model_matrices: NP_x44f8
+    ) -> NP_x3f8:
+        # Corners of the template bounds are sampled per instance, instead of every vertex of every instance.
+        # The resulting box may be slightly larger than the tight one under rotations.
+        if not len(mesh__positions) or not len(instance_model_matrices):
+            return np.zeros((0, 3))
+        corners = np.array(tuple(itertools.product(*zip(
+            mesh__positions.min(axis=0),
+            mesh__positions.max(axis=0),
+            strict=True
+        ))))
+        homogeneous_positions = instance_model_matrices @ np.append(corners, np.ones((len(corners), 1)), axis=1).T
+        positions = homogeneous_positions[:, :3] / homogeneous_positions[:, 3:]
+        return positions.transpose(0, 2, 1).reshape(-1, 3)
+
+    @Lazy.property()
+    @staticmethod
+    def _instance_attributes_buffer_(
+        instance_model_matrices: NP_x44f8,
+        instance_colors: NP_x3f8,
+        instance_opacities: NP_xf8
+    ) -> AttributesBuffer:
+        return AttributesBuffer(
+            field_declarations=(
+                "mat4 in_instance_model_matrix",
+                "vec3 in_instance_color",
+                "float in_instance_opacity"
+            ),
+            data_dict={
+                "in_instance_model_matrix": instance_model_matrices.transpose(0, 2, 1),
+                "in_instance_color": instance_colors,
+                "in_instance_opacity": instance_opacities
+            },
+            # Not drawn on its own. Each vertex of the buffer corresponds to an instance.
+            primitive_mode=PrimitiveMode.POINTS,
+            vertices_count=len(instance_model_matrices)
+        )
+
+    @Lazy.property()
+    @staticmethod
+    def _translucent_(
+        opacity__array: NP_f8,
+        instance_opacities: NP_xf8
+    ) -> bool:
+        return bool(opacity__array < 1.0) or bool((instance_opacities < 1.0).any())
+
+    @Lazy.property()
+    @staticmethod
+    def _mesh_vertex_array_(
+        translucent: bool,
+        color_maps_texture_buffer: TextureBuffer,
+        mesh_uniform_block_buffers__layout: tuple[UniformBlockBuffer, ...],
+        mesh_attributes_buffer: AttributesBuffer,
+        instance_attributes_buffer: AttributesBuffer
+    ) -> VertexArray:
+        return VertexArray(
+            shader_filename="mesh.glsl",
+            custom_macros=(
+                "#define INSTANCED",
+                *(() if translucent else ("#define OPAQUE",))
+            ),
+            texture_buffers=(
+                color_maps_texture_buffer,
+            ),
+            uniform_block_buffers=mesh_uniform_block_buffers__layout,
+            attributes_buffer=mesh_attributes_buffer,
+            instance_attributes_buffer=instance_attributes_buffer
+        )
+
+    def get_instance_count(
+        self: Self
+    ) -> int:
+        return len(self._instance_model_matrices_)
+
+    def set_instances(
+        self: Self,
+        *,
+        model_matrices: NP_x44f8 | None = None,
+        colors: NP_x3f8 | None = None,
+        opacities: NP_xf8 | None = None
+    ) -> Self:
+        # Arrays are indexed by instances, and have to agree with the instance count in length.
+        count = self.get_instance_count()
+        if model_matrices is not None:
+            assert model_matrices.shape == (count, 4, 4)
+            self._instance_model_matrices_ = model_matrices
+        if colors is not None:
+            assert colors.shape == (count, 3)
+            self._instance_colors_ = colors
+        if opacities is not None:
+            assert opacities.shape == (count,)
+            self._instance_opacities_ = opacities
+        return self
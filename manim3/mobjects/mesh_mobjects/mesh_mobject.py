@@ -169,32 +169,50 @@ class MeshMobject(Mobject):
             vertices_count=len(mesh__positions)
         )
 
-    @Lazy.property()
+    @Lazy.property(plural=True)
     @staticmethod
-    def _mesh_vertex_array_(
-        color_maps_texture_buffer: TextureBuffer,
+    def _mesh_uniform_block_buffers_(
         camera__camera_uniform_block_buffer: UniformBlockBuffer,
         lighting__lighting_uniform_block_buffer: UniformBlockBuffer,
         model_uniform_block_buffer: UniformBlockBuffer,
-        material_uniform_block_buffer: UniformBlockBuffer,
+        material_uniform_block_buffer: UniformBlockBuffer
+    ) -> tuple[UniformBlockBuffer, ...]:
+        return (
+            camera__camera_uniform_block_buffer,
+            lighting__lighting_uniform_block_buffer,
+            model_uniform_block_buffer,
+            material_uniform_block_buffer
+        )
+
+    @Lazy.property()
+    @staticmethod
+    def _translucent_(
+        opacity__array: NP_f8
+    ) -> bool:
+        return bool(opacity__array < 1.0)
+
+    @Lazy.property()
+    @staticmethod
+    def _mesh_vertex_array_(
+        translucent: bool,
+        color_maps_texture_buffer: TextureBuffer,
+        mesh_uniform_block_buffers__layout: tuple[UniformBlockBuffer, ...],
         mesh_attributes_buffer: AttributesBuffer
     ) -> VertexArray:
         return VertexArray(
             shader_filename="mesh.glsl",
+            custom_macros=() if translucent else (
+                "#define OPAQUE",
+            ),
             texture_buffers=(
                 color_maps_texture_buffer,
             ),
-            uniform_block_buffers=(
-                camera__camera_uniform_block_buffer,
-                lighting__lighting_uniform_block_buffer,
-                model_uniform_block_buffer,
-                material_uniform_block_buffer
-            ),
+            uniform_block_buffers=mesh_uniform_block_buffers__layout,
             attributes_buffer=mesh_attributes_buffer
         )
 
     def _iter_vertex_arrays(
         self: Self
-    ) -> Iterator[VertexArray]:
+    ) -> Iterator[tuple[VertexArray, tuple[UniformBlockBuffer, ...]]]:
         yield from super()._iter_vertex_arrays()
-        yield self._mesh_vertex_array_
+        yield self._mesh_vertex_array_, self._mesh_uniform_block_buffers_
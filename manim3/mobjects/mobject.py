@@ -4,6 +4,7 @@ from __future__ import annotations
 import itertools
 import weakref
 from typing import (
+    ClassVar,
     Iterator,
     Self
 )
@@ -11,7 +12,9 @@ from typing import (
 from ..animatables.camera import Camera
 from ..animatables.lighting import Lighting
 from ..animatables.model import Model
+from ..constants.custom_typing import NP_x3f8
 from ..lazy.lazy import Lazy
+from ..rendering.buffers.uniform_block_buffer import UniformBlockBuffer
 from ..rendering.vertex_array import VertexArray
 from ..toplevel.toplevel import Toplevel
 
@@ -25,6 +28,9 @@ class Mobject(Model):
         "_proper_ancestors"
     )
 
+    # Bumped whenever any family changes, so that consumers may cache what they derive from families.
+    _family_version: ClassVar[int] = 0
+
     def __init__(
         self: Self
     ) -> None:
@@ -41,50 +47,138 @@ class Mobject(Model):
 
     # family matters
     # These methods implement a DAG (directed acyclic graph).
+    # `_proper_descendants` lists descendants in the order of a depth-first traversal through children,
+    # keeping only the first occurrence of each. It is mirrored by `_proper_siblings_`.
 
     @classmethod
-    def _refresh_families(
+    def _iter_descendants_by_children(
         cls: type[Self],
-        *mobjects: Mobject
-    ) -> None:
+        mobject: Mobject
+    ) -> Iterator[Mobject]:
+        yield mobject
+        for child in mobject._children:
+            yield from cls._iter_descendants_by_children(child)
 
-        def iter_descendants_by_children(
-            mobject: Mobject
-        ) -> Iterator[Mobject]:
-            yield mobject
-            for child in mobject._children:
-                yield from iter_descendants_by_children(child)
+    @classmethod
+    def _iter_ancestors_by_parents(
+        cls: type[Self],
+        mobject: Mobject
+    ) -> Iterator[Mobject]:
+        yield mobject
+        for parent in mobject._parents:
+            yield from cls._iter_ancestors_by_parents(parent)
+
+    @classmethod
+    def _refresh_descendants(
+        cls: type[Self],
+        mobject: Mobject
+    ) -> None:
+        proper_descendants = dict.fromkeys(itertools.chain.from_iterable(
+            cls._iter_descendants_by_children(child)
+            for child in mobject._children
+        ))
+        mobject._proper_descendants.clear()
+        mobject._proper_descendants.extend(proper_descendants)
+        mobject._proper_siblings_ = tuple(proper_descendants)
 
-        def iter_ancestors_by_parents(
-            mobject: Mobject
-        ) -> Iterator[Mobject]:
-            yield mobject
-            for parent in mobject._parents:
-                yield from iter_ancestors_by_parents(parent)
+    @classmethod
+    def _splice_descendants(
+        cls: type[Self],
+        mobject: Mobject,
+        start: int,
+        stop: int,
+        descendants: list[Mobject]
+    ) -> None:
+        # Unchanged siblings are not memoized again, so the cost scales with the splice rather than the family.
+        mobject._proper_descendants[start:stop] = descendants
+        type(mobject)._proper_siblings_.splice_elements(mobject, start, stop, tuple(descendants))
 
+    @classmethod
+    def _refresh_families(
+        cls: type[Self],
+        *mobjects: Mobject
+    ) -> None:
         for proper_ancestor in dict.fromkeys(itertools.chain.from_iterable(
-            iter_ancestors_by_parents(mobject)
+            cls._iter_ancestors_by_parents(mobject)
             for mobject in mobjects
         )):
-            proper_descendants = dict.fromkeys(itertools.chain.from_iterable(
-                iter_descendants_by_children(child)
-                for child in proper_ancestor._children
-            ))
-            proper_ancestor._proper_descendants.clear()
-            proper_ancestor._proper_descendants.extend(proper_descendants)
-            proper_ancestor._proper_siblings_ = tuple(proper_descendants)
+            cls._refresh_descendants(proper_ancestor)
 
         for proper_descendant in dict.fromkeys(itertools.chain.from_iterable(
-            iter_descendants_by_children(mobject)
+            cls._iter_descendants_by_children(mobject)
             for mobject in mobjects
         )):
             proper_ancestors = dict.fromkeys(itertools.chain.from_iterable(
-                iter_ancestors_by_parents(parent)
+                cls._iter_ancestors_by_parents(parent)
                 for parent in proper_descendant._parents
             ))
             proper_descendant._proper_ancestors.clear()
             proper_descendant._proper_ancestors.update(proper_ancestors)
 
+    @classmethod
+    def _extend_families(
+        cls: type[Self],
+        mobject: Mobject,
+        children: list[Mobject]
+    ) -> None:
+        # Called after `children` are appended to `mobject`.
+        # The family of `children` is spliced into each ancestor right after the region of `mobject`,
+        # which is exactly where a full traversal would place it. Ancestors where the region is not contiguous,
+        # or where the family is already partially present, are refreshed by a full traversal instead.
+        family = list(dict.fromkeys(itertools.chain.from_iterable(
+            child.iter_descendants()
+            for child in children
+        )))
+        region = [mobject, *mobject._proper_descendants]
+        for proper_ancestor in mobject._proper_ancestors:
+            proper_descendants = proper_ancestor._proper_descendants
+            start = proper_descendants.index(mobject)
+            stop = start + len(region)
+            if proper_descendants[start:stop] != region or any(
+                proper_ancestor in descendant._proper_ancestors
+                for descendant in family
+            ):
+                cls._refresh_descendants(proper_ancestor)
+                continue
+            cls._splice_descendants(proper_ancestor, stop, stop, family)
+
+        # Descendants already reachable through former children keep their positions.
+        stop = len(mobject._proper_descendants)
+        cls._splice_descendants(mobject, stop, stop, [
+            descendant for descendant in family
+            if mobject not in descendant._proper_ancestors
+        ])
+
+        ancestors = (mobject, *mobject._proper_ancestors)
+        for descendant in family:
+            descendant._proper_ancestors.update(ancestors)
+
+    @classmethod
+    def _shrink_families(
+        cls: type[Self],
+        mobject: Mobject,
+        children: list[Mobject]
+    ) -> None:
+        # Called after `children` are removed from `mobject`.
+        # When the family of a child is a tree only reachable through the child, its region is spliced out
+        # of each ancestor. Otherwise, families are refreshed by full traversals.
+        for child in children:
+            family = list(child.iter_descendants())
+            if child._parents or any(len(descendant._parents) != 1 for descendant in family[1:]):
+                cls._refresh_families(mobject, child)
+                continue
+            ancestors = (mobject, *mobject._proper_ancestors)
+            for ancestor in ancestors:
+                proper_descendants = ancestor._proper_descendants
+                start = proper_descendants.index(child)
+                stop = start + len(family)
+                if proper_descendants[start:stop] != family:
+                    cls._refresh_descendants(ancestor)
+                    continue
+                cls._splice_descendants(ancestor, start, stop, [])
+            for descendant in family:
+                descendant._proper_ancestors.difference_update(ancestors)
+
     def iter_children(
         self: Self
     ) -> Iterator[Mobject]:
@@ -117,29 +211,40 @@ class Mobject(Model):
         self: Self,
         *mobjects: Mobject
     ) -> Self:
+        # Passing many mobjects at once refreshes families in a single pass.
         if (invalid_mobjects := tuple(
             mobject for mobject in mobjects
-            if mobject in self.iter_ancestors()
+            if mobject is self or mobject in self._proper_ancestors
         )):
             raise ValueError(f"Circular relationship occurred when adding {invalid_mobjects} to {self}")
-        for mobject in dict.fromkeys(mobjects):
-            if mobject in self._children:
-                continue
-            self._children.append(mobject)
-            mobject._parents.add(self)
-        type(self)._refresh_families(self, *mobjects)
+        children = [
+            mobject for mobject in dict.fromkeys(mobjects)
+            if self not in mobject._parents
+        ]
+        if not children:
+            return self
+        for child in children:
+            self._children.append(child)
+            child._parents.add(self)
+        type(self)._extend_families(self, children)
+        Mobject._family_version += 1
         return self
 
     def discard(
         self: Self,
         *mobjects: Mobject
     ) -> Self:
-        for mobject in dict.fromkeys(mobjects):
-            if mobject not in self._children:
-                continue
-            self._children.remove(mobject)
-            mobject._parents.remove(self)
-        type(self)._refresh_families(self, *mobjects)
+        children = [
+            mobject for mobject in dict.fromkeys(mobjects)
+            if self in mobject._parents
+        ]
+        if not children:
+            return self
+        for child in children:
+            self._children.remove(child)
+            child._parents.remove(self)
+        type(self)._shrink_families(self, children)
+        Mobject._family_version += 1
         return self
 
     def clear(
@@ -162,16 +267,17 @@ class Mobject(Model):
             if isinstance(descendant_copy, Mobject)
         )]
 
-        for descendant, descendant_copy in zip(descendants, descendants_copy, strict=True):
+        descendant_copies = dict(zip(descendants, descendants_copy, strict=True))
+        for descendant, descendant_copy in descendant_copies.items():
             descendant_copy._children = [
-                descendants_copy[descendants.index(child)]
+                descendant_copies[child]
                 for child in descendant._children
             ]
             descendant_copy._proper_descendants = []
             descendant_copy._parents = weakref.WeakSet(
-                descendants_copy[descendants.index(parent)]
+                descendant_copies[parent]
                 for parent in descendant._parents
-                if parent in descendants
+                if parent in descendant_copies
             )
             descendant_copy._proper_ancestors = weakref.WeakSet()
 
@@ -190,9 +296,26 @@ class Mobject(Model):
     def _lighting_() -> Lighting:
         return Toplevel._get_scene()._lighting
 
+    @Lazy.property()
+    @staticmethod
+    def _translucent_() -> bool:
+        # Translucent mobjects are drawn through order-independent transparency.
+        # Opaque ones are drawn into a depth-tested pass, with the `OPAQUE` variants of their shaders.
+        return True
+
+    @Lazy.property()
+    @staticmethod
+    def _render_bounds_(
+        world_bounds: NP_x3f8
+    ) -> NP_x3f8:
+        # World bounds enclosing what is drawn, against which the renderer culls.
+        return world_bounds
+
     def _iter_vertex_arrays(
         self: Self
-    ) -> Iterator[VertexArray]:
+    ) -> Iterator[tuple[VertexArray, tuple[UniformBlockBuffer, ...]]]:
+        # Yields vertex arrays along with uniform block buffers bound when rendering.
+        # Mobjects not overriding this method are skipped by the renderer altogether.
         yield from ()
 
     def bind_camera(
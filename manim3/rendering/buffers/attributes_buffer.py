@@ -18,6 +18,7 @@ from ..field import (
     Field,
     StructuredField
 )
+from ..pooled_buffer import PooledBuffer
 from .buffer import Buffer
 
 
@@ -103,19 +104,64 @@ class AttributesBuffer(Buffer):
 
     @Lazy.property()
     @staticmethod
-    def _buffer_(
+    def _vertices_render_count_(
+        vertices_count: int,
+        index_bytes: bytes,
+        use_index_buffer: bool
+    ) -> int:
+        # Buffers are streamed into pooled storages whose capacities may exceed the data.
+        # The count has to be specified explicitly when rendering.
+        if not use_index_buffer:
+            return vertices_count
+        return len(index_bytes) // np.dtype(np.uint32).itemsize
+
+    @Lazy.property()
+    @staticmethod
+    def _pooled_buffer_(
         merged_field: StructuredField,
         shape: ShapeType,
         data_dict: dict[str, np.ndarray]
+    ) -> PooledBuffer:
+        data = merged_field.write(shape, data_dict)
+        return Toplevel._get_context().pooled_buffer(
+            data=data,
+            capacity=AttributesBuffer._get_streaming_capacity(len(data))
+        )
+
+    @Lazy.property()
+    @staticmethod
+    def _buffer_(
+        pooled_buffer: PooledBuffer
     ) -> moderngl.Buffer:
-        return Toplevel._get_context().buffer(data=merged_field.write(shape, data_dict))
+        return pooled_buffer.buffer
 
     @Lazy.property()
     @staticmethod
-    def _index_buffer_(
+    def _pooled_index_buffer_(
         index_bytes: bytes,
         use_index_buffer: bool
-    ) -> moderngl.Buffer | None:
+    ) -> PooledBuffer | None:
         if not use_index_buffer:
             return None
-        return Toplevel._get_context().buffer(data=index_bytes)
+        return Toplevel._get_context().pooled_buffer(
+            data=index_bytes,
+            capacity=AttributesBuffer._get_streaming_capacity(len(index_bytes))
+        )
+
+    @Lazy.property()
+    @staticmethod
+    def _index_buffer_(
+        pooled_index_buffer: PooledBuffer | None
+    ) -> moderngl.Buffer | None:
+        if pooled_index_buffer is None:
+            return None
+        return pooled_index_buffer.buffer
+
+    @classmethod
+    def _get_streaming_capacity(
+        cls: type[Self],
+        size: int
+    ) -> int:
+        # Geometries under animation change in size from frame to frame.
+        # Capacities are rounded up to powers of 2, so that storages are recycled across sizes.
+        return 1 << max(size - 1, 0).bit_length()
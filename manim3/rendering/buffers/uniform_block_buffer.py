@@ -13,6 +13,7 @@ from ..field import (
     Field,
     StructuredField
 )
+from ..pooled_buffer import PooledBuffer
 from .buffer import Buffer
 
 
@@ -80,9 +81,36 @@ class UniformBlockBuffer(Buffer):
 
     @Lazy.property()
     @staticmethod
-    def _buffer_(
+    def _layout_(
+        name: str,
+        field_declarations: tuple[str, ...],
+        struct_items: tuple[tuple[str, tuple[str, ...]], ...],
+        array_len_items: tuple[tuple[str, int], ...]
+    ) -> UniformBlockBuffer:
+        # A data-free counterpart sharing the same layout.
+        # Vertex arrays are built upon layouts, so that changes in data do not rebuild them.
+        return UniformBlockBuffer(
+            name=name,
+            field_declarations=field_declarations,
+            structs=dict(struct_items),
+            data_dict={},
+            array_lens=dict(array_len_items)
+        )
+
+    @Lazy.property()
+    @staticmethod
+    def _pooled_buffer_(
         field: StructuredField,
         shape: ShapeType,
         data_dict: dict[str, np.ndarray]
+    ) -> PooledBuffer:
+        # Uniform blocks are rewritten whenever data changes, typically every frame during animations.
+        # Gl buffers of the same std140 size are recycled instead of being allocated and released.
+        return Toplevel._get_context().pooled_buffer(data=field.write(shape, data_dict))
+
+    @Lazy.property()
+    @staticmethod
+    def _buffer_(
+        pooled_buffer: PooledBuffer
     ) -> moderngl.Buffer:
-        return Toplevel._get_context().buffer(data=field.write(shape, data_dict))
+        return pooled_buffer.buffer
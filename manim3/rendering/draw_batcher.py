@@ -0,0 +1,505 @@
+from __future__ import annotations
+
+
+from typing import (
+    ClassVar,
+    Iterable,
+    Self
+)
+
+import numpy as np
+
+from ..constants.custom_typing import (
+    NP_x2i4,
+    NP_xxi4,
+    ShapeType
+)
+from ..lazy.lazy import Lazy
+from ..toplevel.toplevel import Toplevel
+from .buffers.attributes_buffer import AttributesBuffer
+from .buffers.uniform_block_buffer import UniformBlockBuffer
+from .field import StructuredField
+from .mgl_enums import PrimitiveMode
+from .pooled_buffer import PooledBuffer
+from .vertex_array import VertexArray
+
+
+type DrawItem = tuple[VertexArray, tuple[UniformBlockBuffer, ...]]
+
+
+class BatchedAttributesBuffer(AttributesBuffer):
+    __slots__ = ()
+
+    # Storages are rewritten in place by draw batches. They are kept out of lru caches,
+    # so that no other buffer of the same initial content picks them up.
+
+    @Lazy.property(cache_capacity=0)
+    @staticmethod
+    def _pooled_buffer_(
+        merged_field: StructuredField,
+        shape: ShapeType,
+        data_dict: dict[str, np.ndarray]
+    ) -> PooledBuffer:
+        data = merged_field.write(shape, data_dict)
+        return Toplevel._get_context().pooled_buffer(
+            data=data,
+            capacity=AttributesBuffer._get_streaming_capacity(len(data))
+        )
+
+    @Lazy.property(cache_capacity=0)
+    @staticmethod
+    def _pooled_index_buffer_(
+        index_bytes: bytes,
+        use_index_buffer: bool
+    ) -> PooledBuffer | None:
+        if not use_index_buffer:
+            return None
+        return Toplevel._get_context().pooled_buffer(
+            data=index_bytes,
+            capacity=AttributesBuffer._get_streaming_capacity(len(index_bytes))
+        )
+
+
+class BatchedVertexArray(VertexArray):
+    __slots__ = ()
+
+    @Lazy.property(cache_capacity=0)
+    @staticmethod
+    def _pooled_indirect_buffer_(
+        indirect_bytes: bytes
+    ) -> PooledBuffer | None:
+        if not indirect_bytes:
+            return None
+        return Toplevel._get_context().pooled_buffer(
+            data=indirect_bytes,
+            capacity=AttributesBuffer._get_streaming_capacity(len(indirect_bytes))
+        )
+
+
+class DrawBatchInfo:
+    __slots__ = (
+        "_static_key",
+        "_shared_indices",
+        "_per_draw_indices"
+    )
+
+    def __init__(
+        self: Self,
+        static_key: tuple,
+        shared_indices: tuple[int, ...],
+        per_draw_indices: tuple[int, ...]
+    ) -> None:
+        super().__init__()
+        # Draw items agreeing in the static key and in shared uniform block buffers are batched together.
+        self._static_key: tuple = static_key
+        self._shared_indices: tuple[int, ...] = shared_indices
+        self._per_draw_indices: tuple[int, ...] = per_draw_indices
+
+
+class DrawBatch:
+    __slots__ = (
+        "_attributes_buffers",
+        "_vertex_ranges",
+        "_index_ranges",
+        "_indirect_commands",
+        "_per_draw_uniform_block_buffers",
+        "_vertex_array",
+        "_draws_uniform_block_buffer"
+    )
+
+    def __init__(
+        self: Self
+    ) -> None:
+        super().__init__()
+        self._attributes_buffers: tuple[AttributesBuffer, ...] = ()
+        # Offsets and capacities of members in the shared vertex buffer and the shared index buffer.
+        self._vertex_ranges: NP_x2i4 = np.zeros((0, 2), dtype=np.int32)
+        self._index_ranges: NP_x2i4 = np.zeros((0, 2), dtype=np.int32)
+        self._indirect_commands: NP_xxi4 = np.zeros((0, 5), dtype=np.int32)
+        self._per_draw_uniform_block_buffers: tuple[UniformBlockBuffer, ...] = ()
+        self._vertex_array: VertexArray | None = None
+        self._draws_uniform_block_buffer: UniformBlockBuffer | None = None
+
+    def update(
+        self: Self,
+        draw_batch_info: DrawBatchInfo,
+        draw_items: tuple[DrawItem, ...],
+        capacity: int
+    ) -> DrawItem:
+        # Geometries and per-draw data are gathered separately, each only when members change.
+        # Under animations, typically only per-draw data is rewritten, into a single uniform block buffer,
+        # and geometries of animated members are rewritten in place.
+        template_vertex_array, template_uniform_block_buffers = draw_items[0]
+        attributes_buffers = tuple(vertex_array._attributes_buffer_ for vertex_array, _ in draw_items)
+        per_draw_uniform_block_buffers = tuple(
+            uniform_block_buffers[index]
+            for _, uniform_block_buffers in draw_items
+            for index in draw_batch_info._per_draw_indices
+        )
+        per_draw_layouts = tuple(
+            template_vertex_array._uniform_block_buffers_[index]
+            for index in draw_batch_info._per_draw_indices
+        )
+
+        if (draws_uniform_block_buffer := self._draws_uniform_block_buffer) is None \
+                or per_draw_uniform_block_buffers != self._per_draw_uniform_block_buffers:
+            draws_uniform_block_buffer = type(self)._get_draws_uniform_block_buffer(
+                per_draw_layouts=per_draw_layouts,
+                per_draw_uniform_block_buffers=per_draw_uniform_block_buffers,
+                capacity=capacity
+            )
+            self._per_draw_uniform_block_buffers = per_draw_uniform_block_buffers
+            self._draws_uniform_block_buffer = draws_uniform_block_buffer
+
+        if (vertex_array := self._vertex_array) is None \
+                or not self._rewrite_attributes_buffers(vertex_array, attributes_buffers):
+            index_counts = np.fromiter((
+                len(attributes_buffer._index_bytes_) // np.dtype(np.uint32).itemsize
+                for attributes_buffer in attributes_buffers
+            ), dtype=np.int32)
+            vertex_ranges = type(self)._get_ranges(np.fromiter((
+                attributes_buffer._vertices_count_
+                for attributes_buffer in attributes_buffers
+            ), dtype=np.int32))
+            index_ranges = type(self)._get_ranges(index_counts)
+            indirect_commands = np.column_stack((
+                index_counts,
+                np.ones(len(attributes_buffers), dtype=np.int32),
+                index_ranges[:, 0],
+                vertex_ranges[:, 0],
+                np.arange(len(attributes_buffers), dtype=np.int32)
+            ))
+            vertex_array = type(self)._get_vertex_array(
+                template_vertex_array=template_vertex_array,
+                shared_indices=draw_batch_info._shared_indices,
+                draws_layout=draws_uniform_block_buffer._layout_,
+                attributes_buffers=attributes_buffers,
+                vertex_ranges=vertex_ranges,
+                index_ranges=index_ranges,
+                indirect_commands=indirect_commands,
+                capacity=capacity
+            )
+            self._attributes_buffers = attributes_buffers
+            self._vertex_ranges = vertex_ranges
+            self._index_ranges = index_ranges
+            self._indirect_commands = indirect_commands
+            self._vertex_array = vertex_array
+
+        return vertex_array, (
+            *(template_uniform_block_buffers[index] for index in draw_batch_info._shared_indices),
+            draws_uniform_block_buffer
+        )
+
+    def _rewrite_attributes_buffers(
+        self: Self,
+        vertex_array: VertexArray,
+        attributes_buffers: tuple[AttributesBuffer, ...]
+    ) -> bool:
+        # Members are matched by positions, and only changed ones are rewritten within their ranges,
+        # along with their draw commands. Returns false if the batch has to be rebuilt instead,
+        # when the number of members changes, or when a member outgrows its range.
+        if len(attributes_buffers) != len(self._attributes_buffers):
+            return False
+        changed_indices = [
+            index
+            for index, (attributes_buffer, previous_attributes_buffer) in enumerate(
+                zip(attributes_buffers, self._attributes_buffers, strict=True)
+            )
+            if attributes_buffer is not previous_attributes_buffer
+        ]
+        if not changed_indices:
+            return True
+        if any(
+            attributes_buffers[index]._vertices_count_ > self._vertex_ranges[index, 1]
+            or len(attributes_buffers[index]._index_bytes_) // np.dtype(np.uint32).itemsize > self._index_ranges[index, 1]
+            for index in changed_indices
+        ):
+            return False
+        if (vertex_array_info := vertex_array._vertex_array_info_) is None \
+                or (indirect_buffer := vertex_array_info.indirect_buffer) is None \
+                or (index_buffer := vertex_array._attributes_buffer_._index_buffer_) is None:
+            return False
+
+        vertex_buffer = vertex_array._attributes_buffer_._buffer_
+        vertex_itemsize = vertex_array._attributes_buffer_._merged_field_._packing_plan_.itemsize
+        index_itemsize = np.dtype(np.uint32).itemsize
+        indirect_commands = self._indirect_commands
+        for index in changed_indices:
+            attributes_buffer = attributes_buffers[index]
+            if (vertex_bytes := attributes_buffer._merged_field_.write(attributes_buffer._shape_, attributes_buffer._data_dict_)):
+                vertex_buffer.write(vertex_bytes, offset=int(self._vertex_ranges[index, 0]) * vertex_itemsize)
+            if (index_bytes := attributes_buffer._index_bytes_):
+                index_buffer.write(index_bytes, offset=int(self._index_ranges[index, 0]) * index_itemsize)
+            indirect_commands[index, 0] = len(index_bytes) // index_itemsize
+        indirect_buffer.write(indirect_commands.astype(np.uint32).tobytes())
+        self._attributes_buffers = attributes_buffers
+        return True
+
+    @classmethod
+    def _get_ranges(
+        cls: type[Self],
+        counts: np.ndarray
+    ) -> NP_x2i4:
+        # Each member is given a range with spare room, so that it may grow in place under animations.
+        capacities = np.fromiter((
+            AttributesBuffer._get_streaming_capacity(int(count))
+            for count in counts
+        ), dtype=np.int32, count=len(counts))
+        return np.column_stack((np.cumsum(capacities) - capacities, capacities))
+
+    @classmethod
+    def _get_draws_uniform_block_buffer(
+        cls: type[Self],
+        per_draw_layouts: tuple[UniformBlockBuffer, ...],
+        per_draw_uniform_block_buffers: tuple[UniformBlockBuffer, ...],
+        capacity: int
+    ) -> UniformBlockBuffer:
+        # Fields of per-draw uniform blocks are merged into a struct, with the `u_` prefix stripped.
+        # Each block is padded to a multiple of 16 bytes, so the struct layout agrees with the blocks laid end to end.
+        per_draw_count = len(per_draw_layouts)
+        data_dict: dict[str, np.ndarray] = {}
+        for index, layout in enumerate(per_draw_layouts):
+            data_arrays_dict: dict[str, list[np.ndarray]] = {}
+            for uniform_block_buffer in per_draw_uniform_block_buffers[index::per_draw_count]:
+                for name, data in uniform_block_buffer._data_dict_.items():
+                    data_arrays_dict.setdefault(name, []).append(data)
+            for name, data_arrays in data_arrays_dict.items():
+                data = np.zeros((capacity, *data_arrays[0].shape))
+                data[:len(data_arrays)] = data_arrays
+                data_dict[f"u_draws.{name.removeprefix("u_")}"] = data
+        return UniformBlockBuffer(
+            name="ub_draws",
+            field_declarations=(
+                "Draw u_draws[NUM_U_DRAWS]",
+            ),
+            structs={
+                "Draw": tuple(
+                    field_declaration.replace(" u_", " ", 1)
+                    for layout in per_draw_layouts
+                    for field_declaration in layout._field_declarations_
+                )
+            },
+            data_dict=data_dict,
+            array_lens={
+                "NUM_U_DRAWS": capacity
+            }
+        )
+
+    @classmethod
+    def _get_vertex_array(
+        cls: type[Self],
+        template_vertex_array: VertexArray,
+        shared_indices: tuple[int, ...],
+        draws_layout: UniformBlockBuffer,
+        attributes_buffers: tuple[AttributesBuffer, ...],
+        vertex_ranges: NP_x2i4,
+        index_ranges: NP_x2i4,
+        indirect_commands: NP_xxi4,
+        capacity: int
+    ) -> VertexArray:
+        # Geometries are suballocated in a shared vertex buffer and a shared index buffer.
+        # Indices are kept local to each draw, and offset by base vertices in draw commands.
+        # Spare room of ranges is left zeroed, and is never drawn.
+        template_attributes_buffer = attributes_buffers[0]
+        vertices_capacity = int(vertex_ranges[:, 1].sum())
+        data_dict: dict[str, np.ndarray] = {}
+        for name, template_data in template_attributes_buffer._data_dict_.items():
+            data = np.zeros((vertices_capacity, *template_data.shape[1:]), dtype=template_data.dtype)
+            for attributes_buffer, (vertex_offset, _) in zip(attributes_buffers, vertex_ranges, strict=True):
+                member_data = attributes_buffer._data_dict_[name]
+                data[vertex_offset:vertex_offset + len(member_data)] = member_data
+            data_dict[name] = data
+        index = np.zeros(int(index_ranges[:, 1].sum()), dtype=np.uint32)
+        for attributes_buffer, (index_offset, _) in zip(attributes_buffers, index_ranges, strict=True):
+            member_index = np.frombuffer(attributes_buffer._index_bytes_, dtype=np.uint32)
+            index[index_offset:index_offset + len(member_index)] = member_index
+        return BatchedVertexArray(
+            shader_filename=template_vertex_array._shader_filename_,
+            custom_macros=(
+                *template_vertex_array._custom_macros_,
+                "#define BATCHED"
+            ),
+            texture_buffers=template_vertex_array._texture_buffers_,
+            uniform_block_buffers=(
+                *(template_vertex_array._uniform_block_buffers_[index] for index in shared_indices),
+                draws_layout
+            ),
+            attributes_buffer=BatchedAttributesBuffer(
+                field_declarations=template_attributes_buffer._field_declarations_,
+                data_dict=data_dict,
+                index=index,
+                primitive_mode=template_attributes_buffer._primitive_mode_,
+                vertices_count=vertices_capacity,
+                array_lens=dict(template_attributes_buffer._array_len_items_)
+            ),
+            instance_attributes_buffer=AttributesBuffer(
+                field_declarations=(
+                    "int in_draw_id",
+                ),
+                data_dict={
+                    "in_draw_id": np.arange(capacity, dtype=np.int32)
+                },
+                # Not drawn on its own. Draw ids are fetched through base instances of draw commands.
+                primitive_mode=PrimitiveMode.POINTS,
+                vertices_count=capacity
+            ),
+            indirect_commands=indirect_commands
+        )
+
+
+class DrawBatcher:
+    __slots__ = (
+        "_preserve_order",
+        "_draw_items",
+        "_batched_draw_items",
+        "_draw_batch_infos",
+        "_draw_batches"
+    )
+
+    # Shaders with a batched variant, mapped to their per-draw uniform blocks.
+    # The batched variant, enabled by `BATCHED`, gathers per-draw uniform blocks into a struct array `ub_draws`,
+    # indexed by draw ids, and is issued with a single multi-draw-indirect call.
+    _per_draw_uniform_block_names_dict: ClassVar[dict[str, tuple[str, ...]]] = {
+        "mesh.glsl": ("ub_model", "ub_material"),
+        "graph.glsl": ("ub_model", "ub_graph")
+    }
+
+    def __init__(
+        self: Self,
+        # Whether only runs of consecutive compatible draw items are batched, so that draw order is kept.
+        # Required where later draws win, as in depth-tested passes with coplanar mobjects.
+        preserve_order: bool = False
+    ) -> None:
+        super().__init__()
+        self._preserve_order: bool = preserve_order
+        self._draw_items: tuple[DrawItem, ...] = ()
+        self._batched_draw_items: tuple[DrawItem, ...] = ()
+        self._draw_batch_infos: dict[VertexArray, DrawBatchInfo | None] = {}
+        self._draw_batches: dict[tuple[tuple, int, int], DrawBatch] = {}
+
+    def batch(
+        self: Self,
+        draw_items: Iterable[DrawItem]
+    ) -> tuple[DrawItem, ...]:
+        # Draw items that cannot be batched, or that do not share a batch with others, are passed through.
+        # Unless order is preserved, compatible draw items are gathered from anywhere in the list,
+        # which the order-independent transparency pipeline tolerates.
+        draw_items = tuple(draw_items)
+        if draw_items == self._draw_items:
+            return self._batched_draw_items
+
+        draw_batch_infos: dict[VertexArray, DrawBatchInfo | None] = {}
+        groups: list[tuple[DrawBatchInfo | None, list[DrawItem]]] = []
+        group_positions: dict[tuple, int] = {}
+        previous_key: tuple | None = None
+        for draw_item in draw_items:
+            vertex_array, uniform_block_buffers = draw_item
+            if vertex_array not in draw_batch_infos:
+                draw_batch_infos[vertex_array] = (
+                    self._draw_batch_infos[vertex_array]
+                    if vertex_array in self._draw_batch_infos
+                    else type(self)._get_draw_batch_info(vertex_array)
+                )
+            if (draw_batch_info := draw_batch_infos[vertex_array]) is None:
+                groups.append((None, [draw_item]))
+                previous_key = None
+                continue
+            key = (
+                draw_batch_info._static_key,
+                tuple(uniform_block_buffers[index] for index in draw_batch_info._shared_indices)
+            )
+            if self._preserve_order:
+                if key != previous_key:
+                    groups.append((draw_batch_info, []))
+                    previous_key = key
+                groups[-1][1].append(draw_item)
+                continue
+            if (group_position := group_positions.get(key)) is None:
+                group_position = group_positions[key] = len(groups)
+                groups.append((draw_batch_info, []))
+            groups[group_position][1].append(draw_item)
+
+        # Batches are retained across frames, keyed without shared uniform block buffers,
+        # so that batches survive camera or lighting changes.
+        draw_batches: dict[tuple[tuple, int, int], DrawBatch] = {}
+        group_indices: dict[tuple, int] = {}
+        batched_draw_items: list[DrawItem] = []
+        for draw_batch_info, group in groups:
+            if draw_batch_info is None or len(group) == 1:
+                batched_draw_items.extend(group)
+                continue
+            static_key = draw_batch_info._static_key
+            group_index = group_indices[static_key] = group_indices.get(static_key, -1) + 1
+            max_capacity = type(self)._get_max_capacity(draw_batch_info, group[0][0])
+            for chunk_index, chunk_start in enumerate(range(0, len(group), max_capacity)):
+                chunk = tuple(group[chunk_start:chunk_start + max_capacity])
+                batch_key = (static_key, group_index, chunk_index)
+                if (draw_batch := self._draw_batches.get(batch_key)) is None:
+                    draw_batch = DrawBatch()
+                draw_batches[batch_key] = draw_batch
+                batched_draw_items.append(draw_batch.update(
+                    draw_batch_info=draw_batch_info,
+                    draw_items=chunk,
+                    capacity=min(AttributesBuffer._get_streaming_capacity(len(chunk)), max_capacity)
+                ))
+
+        self._draw_items = draw_items
+        self._batched_draw_items = tuple(batched_draw_items)
+        self._draw_batch_infos = draw_batch_infos
+        self._draw_batches = draw_batches
+        return self._batched_draw_items
+
+    @classmethod
+    def _get_draw_batch_info(
+        cls: type[Self],
+        vertex_array: VertexArray
+    ) -> DrawBatchInfo | None:
+        shader_filename = vertex_array._shader_filename_
+        if (per_draw_uniform_block_names := cls._per_draw_uniform_block_names_dict.get(shader_filename)) is None:
+            return None
+        attributes_buffer = vertex_array._attributes_buffer_
+        if (
+            vertex_array._instance_attributes_buffer_ is not None
+            or vertex_array._indirect_bytes_
+            or not attributes_buffer._use_index_buffer_
+        ):
+            return None
+
+        shared_indices: list[int] = []
+        per_draw_indices: list[int] = []
+        for index, layout in enumerate(vertex_array._uniform_block_buffers_):
+            if layout._name_ not in per_draw_uniform_block_names:
+                shared_indices.append(index)
+                continue
+            if layout._struct_items_ or layout._array_len_items_:
+                return None
+            per_draw_indices.append(index)
+
+        return DrawBatchInfo(
+            static_key=(
+                shader_filename,
+                vertex_array._custom_macros_,
+                tuple(
+                    (texture_buffer._name_, texture_buffer._textures_, texture_buffer._array_len_items_)
+                    for texture_buffer in vertex_array._texture_buffers_
+                ),
+                vertex_array._uniform_block_buffers_,
+                attributes_buffer._field_declarations_,
+                attributes_buffer._array_len_items_,
+                attributes_buffer._primitive_mode_
+            ),
+            shared_indices=tuple(shared_indices),
+            per_draw_indices=tuple(per_draw_indices)
+        )
+
+    @classmethod
+    def _get_max_capacity(
+        cls: type[Self],
+        draw_batch_info: DrawBatchInfo,
+        vertex_array: VertexArray
+    ) -> int:
+        draw_itemsize = sum(
+            vertex_array._uniform_block_buffers_[index]._field_._itemsize_
+            for index in draw_batch_info._per_draw_indices
+        )
+        return Toplevel._get_context().max_uniform_block_size // draw_itemsize
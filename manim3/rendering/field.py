@@ -8,6 +8,7 @@ from typing import (
     Self
 )
 
+import attrs
 import numpy as np
 
 from ..constants.custom_typing import ShapeType
@@ -15,6 +16,22 @@ from ..lazy.lazy import Lazy
 from ..lazy.lazy_object import LazyObject
 
 
+@attrs.frozen(kw_only=True)
+class PackingStep:
+    key: str
+    offset: int
+    shape: ShapeType
+    strides: tuple[int, ...]
+    dtype: np.dtype
+    size: int
+
+
+@attrs.frozen(kw_only=True)
+class PackingPlan:
+    itemsize: int
+    packing_steps: tuple[PackingStep, ...]
+
+
 class Field(LazyObject):
     __slots__ = ()
 
@@ -111,6 +128,36 @@ class Field(LazyObject):
     def _pointers_() -> tuple[tuple[tuple[str, ...], int], ...]:
         return ()
 
+    @Lazy.property()
+    @staticmethod
+    def _packing_plan_(
+        dtype: np.dtype,
+        pointers: tuple[tuple[tuple[str, ...], int], ...]
+    ) -> PackingPlan:
+        # Locate every atomic field within a single item once, in terms of offsets and strides.
+        # Axes padded for vectors and scalars are dropped, so that data can be assigned without expansion.
+        np_item = np.zeros((), dtype=dtype)
+        item_address = np_item.__array_interface__["data"][0]
+        packing_steps: list[PackingStep] = []
+        for name_chain, base_ndim in pointers:
+            np_item_pointer = np_item
+            for name in name_chain:
+                np_item_pointer = np_item_pointer[name]
+            np_item_pointer = np_item_pointer["_"]
+            np_item_pointer = np.squeeze(np_item_pointer, axis=tuple(range(-2, -base_ndim)))
+            packing_steps.append(PackingStep(
+                key=".".join(name_chain),
+                offset=np_item_pointer.__array_interface__["data"][0] - item_address,
+                shape=np_item_pointer.shape,
+                strides=np_item_pointer.strides,
+                dtype=np_item_pointer.dtype,
+                size=np_item_pointer.size
+            ))
+        return PackingPlan(
+            itemsize=dtype.itemsize,
+            packing_steps=tuple(packing_steps)
+        )
+
     @classmethod
     def _parse_field_declaration(
         cls: type[Self],
@@ -195,21 +242,44 @@ class Field(LazyObject):
         }
         return np_buffer, np_buffer_pointers
 
-    def write(
+    def write_into(
         self: Self,
         shape: ShapeType,
-        data_dict: dict[str, np.ndarray]
-    ) -> bytes:
-        np_buffer, np_buffer_pointers = self._get_np_buffer_and_pointers(shape)
-        for key, (np_buffer_pointer, base_ndim) in np_buffer_pointers.items():
-            data = data_dict[key]
-            if not np_buffer_pointer.size:
+        data_dict: dict[str, np.ndarray],
+        buffer: bytearray | memoryview
+    ) -> None:
+        # Data is cast and packed in place. Paddings in `buffer` are left untouched.
+        packing_plan = self._packing_plan_
+        itemsize = packing_plan.itemsize
+        size = functools.reduce(int.__mul__, shape, 1)
+        assert len(buffer) >= size * itemsize
+        outer_strides = tuple(
+            itemsize * functools.reduce(int.__mul__, shape[index + 1:], 1)
+            for index in range(len(shape))
+        )
+        for packing_step in packing_plan.packing_steps:
+            data = data_dict[packing_step.key]
+            if not size or not packing_step.size:
                 assert not data.size
                 continue
-            data_expanded = np.expand_dims(data, axis=tuple(range(-2, -base_ndim)))
-            assert np_buffer_pointer.shape == data_expanded.shape
-            np_buffer_pointer[...] = data_expanded
-        return np_buffer.tobytes()
+            np_buffer_pointer = np.ndarray(
+                shape=shape + packing_step.shape,
+                dtype=packing_step.dtype,
+                buffer=buffer,
+                offset=packing_step.offset,
+                strides=outer_strides + packing_step.strides
+            )
+            assert np_buffer_pointer.shape == data.shape
+            np_buffer_pointer[...] = data
+
+    def write(
+        self: Self,
+        shape: ShapeType,
+        data_dict: dict[str, np.ndarray]
+    ) -> bytearray:
+        buffer = bytearray(functools.reduce(int.__mul__, shape, 1) * self._packing_plan_.itemsize)
+        self.write_into(shape, data_dict, buffer)
+        return buffer
 
     def read(
         self: Self,
@@ -1,12 +1,16 @@
 from __future__ import annotations
 
 
-from typing import Self
+from typing import (
+    Iterable,
+    Self
+)
 
 import attrs
 import moderngl
 
 from ...toplevel.toplevel import Toplevel
+from ..buffers.uniform_block_buffer import UniformBlockBuffer
 from ..mgl_enums import (
     BlendEquation,
     BlendFunc,
@@ -27,19 +31,29 @@ class AttachmentInfo:
 class Framebuffer:
     __slots__ = (
         "_named_attachments",
+        "_depth_attachment",
         "_framebuffer",
         "_blendings",
-        "_flag"
+        "_flag",
+        "_order_independent"
     )
 
     def __init__(
         self: Self,
         attachment_info_dict: dict[str, AttachmentInfo],
         samples: int,
-        flag: ContextFlag
+        flag: ContextFlag,
+        # Whether blendings are commutative, so that draws may be reordered.
+        order_independent: bool = False,
+        # May be shared with other framebuffers, which test against depths without writing them.
+        depth_attachment: moderngl.Texture | None = None,
+        depth_write: bool = False,
+        # Defaults to the pixel size of frames.
+        size: tuple[int, int] | None = None
     ) -> None:
         super().__init__()
-        size = Toplevel._get_config().pixel_size
+        if size is None:
+            size = Toplevel._get_config().pixel_size
         attachment_items = tuple(
             (
                 name,
@@ -57,13 +71,19 @@ class Framebuffer:
         self._named_attachments: dict[str, moderngl.Texture] = {
             name: attachment for name, attachment, _ in attachment_items
         }
-        self._framebuffer: moderngl.Framebuffer = Toplevel._get_context().framebuffer(color_attachments=tuple(
-            attachment for _, attachment, _ in attachment_items
-        ))
+        framebuffer = Toplevel._get_context().framebuffer(
+            color_attachments=tuple(attachment for _, attachment, _ in attachment_items),
+            depth_attachment=depth_attachment
+        )
+        # Moderngl applies the depth mask whenever the framebuffer is used or cleared.
+        framebuffer.depth_mask = depth_write
+        self._depth_attachment: moderngl.Texture | None = depth_attachment
+        self._framebuffer: moderngl.Framebuffer = framebuffer
         self._blendings: tuple[tuple[BlendFunc, BlendFunc, BlendEquation], ...] = tuple(
             blending for _, _, blending in attachment_items
         )
         self._flag: ContextFlag = flag
+        self._order_independent: bool = order_independent
 
     def get_attachment(
         self: Self,
@@ -71,32 +91,59 @@ class Framebuffer:
     ) -> moderngl.Texture:
         return self._named_attachments[name]
 
+    def get_depth_attachment(
+        self: Self
+    ) -> moderngl.Texture:
+        assert (depth_attachment := self._depth_attachment) is not None
+        return depth_attachment
+
     def clear(
         self: Self,
         color: tuple[float, float, float, float] | None = None
     ) -> None:
-        self._framebuffer.clear(color=color)
+        # Depths are only cleared if written by this framebuffer.
+        Toplevel._get_context().clear_framebuffer(self._framebuffer, color=color)
 
     def render(
         self: Self,
-        vertex_array: VertexArray
+        vertex_array: VertexArray,
+        # Buffers supplying uniform block data, in the order of the uniform block buffers the vertex array
+        # is built upon, typically their layouts. Defaults to the uniform block buffers themselves.
+        uniform_block_buffers: tuple[UniformBlockBuffer, ...] | None = None
     ) -> None:
-        if (vertex_array_info := vertex_array._vertex_array_info_) is None:
-            return None
+        if uniform_block_buffers is None:
+            uniform_block_buffers = vertex_array._uniform_block_buffers_
+        self.render_all(((vertex_array, uniform_block_buffers),))
 
-        uniform_block_buffer_dict = {
-            uniform_block_buffer._name_: uniform_block_buffer
-            for uniform_block_buffer in vertex_array._uniform_block_buffers_
-        }
-
-        with Toplevel._get_context().scope(
-            framebuffer=self._framebuffer,
-            textures=vertex_array_info.texture_bindings,
-            uniform_buffers=tuple(
-                (uniform_block_buffer_dict[name]._buffer_, binding)
-                for name, binding in vertex_array_info.uniform_block_bindings
+    def render_all(
+        self: Self,
+        draw_items: Iterable[tuple[VertexArray, tuple[UniformBlockBuffer, ...]]]
+    ) -> None:
+        # Gl states are set through the context, which skips those already in place.
+        # Where the order does not matter, draws are grouped by programs and textures to share bindings.
+        context = Toplevel._get_context()
+        context.use_framebuffer(self._framebuffer)
+        context.set_blendings(self._blendings)
+        context.set_flag(self._flag)
+        draw_infos = [
+            (vertex_array_info, uniform_block_buffers)
+            for vertex_array, uniform_block_buffers in draw_items
+            if (vertex_array_info := vertex_array._vertex_array_info_) is not None
+        ]
+        if self._order_independent:
+            draw_infos.sort(key=lambda draw_info: draw_info[0].sort_key)
+        for vertex_array_info, uniform_block_buffers in draw_infos:
+            for texture, binding in vertex_array_info.texture_bindings:
+                context.use_texture(texture, binding)
+            for index, binding in vertex_array_info.uniform_block_bindings:
+                context.bind_uniform_buffer(uniform_block_buffers[index]._buffer_, binding)
+            if (indirect_buffer := vertex_array_info.indirect_buffer) is not None:
+                vertex_array_info.vertex_array.render_indirect(
+                    indirect_buffer,
+                    count=vertex_array_info.indirect_count
+                )
+                continue
+            vertex_array_info.vertex_array.render(
+                vertices=vertex_array_info.vertices_count,
+                instances=vertex_array_info.instances_count
             )
-        ):
-            Toplevel._get_context().set_blendings(self._blendings)
-            Toplevel._get_context().set_flag(self._flag)
-            vertex_array_info.vertex_array.render()
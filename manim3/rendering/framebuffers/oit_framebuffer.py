@@ -21,7 +21,9 @@ class OITFramebuffer(Framebuffer):
 
     def __init__(
         self: Self,
-        samples: int = 0
+        samples: int = 0,
+        # Translucent fragments behind opaque ones are discarded by testing against the depths of the opaque pass.
+        depth_attachment: moderngl.Texture | None = None
     ) -> None:
         super().__init__(
             attachment_info_dict={
@@ -41,5 +43,7 @@ class OITFramebuffer(Framebuffer):
                 )
             },
             samples=samples,
-            flag=ContextFlag.BLEND
+            flag=ContextFlag.BLEND if depth_attachment is None else ContextFlag.BLEND | ContextFlag.DEPTH_TEST,
+            order_independent=True,
+            depth_attachment=depth_attachment
         )
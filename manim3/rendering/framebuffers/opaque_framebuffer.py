@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+
+from typing import Self
+
+from ...toplevel.toplevel import Toplevel
+from ..mgl_enums import (
+    BlendEquation,
+    BlendFunc,
+    ContextFlag
+)
+from .framebuffer import (
+    Framebuffer,
+    AttachmentInfo
+)
+
+
+class OpaqueFramebuffer(Framebuffer):
+    __slots__ = ()
+
+    def __init__(
+        self: Self,
+        samples: int = 0
+    ) -> None:
+        super().__init__(
+            attachment_info_dict={
+                "color": AttachmentInfo(
+                    components=4,
+                    dtype="f1",
+                    src_blend_func=BlendFunc.ONE,
+                    dst_blend_func=BlendFunc.ZERO,
+                    blend_equation=BlendEquation.FUNC_ADD
+                )
+            },
+            samples=samples,
+            flag=ContextFlag.DEPTH_TEST,
+            depth_attachment=Toplevel._get_context().depth_texture(
+                size=Toplevel._get_config().pixel_size,
+                samples=samples
+            ),
+            depth_write=True
+        )
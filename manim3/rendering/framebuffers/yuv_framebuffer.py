@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+
+from typing import Self
+
+from ...toplevel.toplevel import Toplevel
+from ..mgl_enums import (
+    BlendEquation,
+    BlendFunc,
+    ContextFlag
+)
+from .framebuffer import (
+    Framebuffer,
+    AttachmentInfo
+)
+
+
+class YUVFramebuffer(Framebuffer):
+    __slots__ = ()
+
+    def __init__(
+        self: Self
+    ) -> None:
+        # Holds a frame in planar yuv420p, as 4-byte texels in rows of half the frame width.
+        pixel_width, pixel_height = Toplevel._get_config().pixel_size
+        super().__init__(
+            attachment_info_dict={
+                "": AttachmentInfo(
+                    components=4,
+                    dtype="f1",
+                    src_blend_func=BlendFunc.ONE,
+                    dst_blend_func=BlendFunc.ZERO,
+                    blend_equation=BlendEquation.FUNC_ADD
+                )
+            },
+            samples=0,
+            flag=ContextFlag.NOTHING,
+            size=(pixel_width // 8, pixel_height * 3)
+        )
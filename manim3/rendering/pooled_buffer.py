@@ -0,0 +1,39 @@
+from __future__ import annotations
+
+
+import weakref
+from typing import (
+    Callable,
+    Self
+)
+
+import moderngl
+
+
+class PooledBuffer:
+    __slots__ = (
+        "__weakref__",
+        "_buffer"
+    )
+
+    def __init__(
+        self: Self,
+        buffer: moderngl.Buffer,
+        recycle: Callable[[moderngl.Buffer], None]
+    ) -> None:
+        super().__init__()
+        self._buffer: moderngl.Buffer = buffer
+        # Hand the buffer back to the pool once the handle is no longer referenced.
+        weakref.finalize(self, recycle, buffer)
+
+    def __sizeof__(
+        self: Self
+    ) -> int:
+        # Reports the storage held from the pool, for size estimation of lazy caches.
+        return super().__sizeof__() + self._buffer.size
+
+    @property
+    def buffer(
+        self: Self
+    ) -> moderngl.Buffer:
+        return self._buffer
@@ -7,7 +7,9 @@ from typing import Self
 
 import attrs
 import moderngl
+import numpy as np
 
+from ..constants.custom_typing import NP_xxi4
 from ..lazy.lazy import Lazy
 from ..lazy.lazy_object import LazyObject
 from ..toplevel.toplevel import Toplevel
@@ -18,6 +20,7 @@ from .field import (
     AtomicField,
     StructuredField
 )
+from .pooled_buffer import PooledBuffer
 
 
 @attrs.frozen(kw_only=True)
@@ -62,8 +65,18 @@ class ProgramAttributeInfo:
 @attrs.frozen(kw_only=True)
 class VertexArrayInfo:
     texture_bindings: tuple[tuple[moderngl.Texture, int], ...]
-    uniform_block_bindings: tuple[tuple[str, int], ...]
+    # Pairs of indices into the uniform block buffers the vertex array is built upon, and bindings.
+    uniform_block_bindings: tuple[tuple[int, int], ...]
     vertex_array: moderngl.VertexArray
+    vertices_count: int
+    instances_count: int
+    # If present, draw commands are sourced from the buffer, issuing a single multi-draw call.
+    indirect_buffer: moderngl.Buffer | None
+    indirect_count: int
+    # Hold pooled storages, so that they are not recycled while the vertex array is alive.
+    pooled_buffers: tuple[PooledBuffer, ...]
+    # Gl names of the program and textures. Draws sorted by these keys share bindings between neighbors.
+    sort_key: tuple[int, ...]
 
 
 class VertexArray(LazyObject):
@@ -76,7 +89,9 @@ class VertexArray(LazyObject):
         custom_macros: tuple[str, ...] = (),
         texture_buffers: tuple[TextureBuffer, ...] = (),
         uniform_block_buffers: tuple[UniformBlockBuffer, ...] = (),
-        attributes_buffer: AttributesBuffer
+        attributes_buffer: AttributesBuffer,
+        instance_attributes_buffer: AttributesBuffer | None = None,
+        indirect_commands: NP_xxi4 | None = None
     ) -> None:
         super().__init__()
         self._shader_filename_ = shader_filename
@@ -84,6 +99,10 @@ class VertexArray(LazyObject):
         self._texture_buffers_ = texture_buffers
         self._uniform_block_buffers_ = uniform_block_buffers
         self._attributes_buffer_ = attributes_buffer
+        if instance_attributes_buffer is not None:
+            self._instance_attributes_buffer_ = instance_attributes_buffer
+        if indirect_commands is not None:
+            self._indirect_bytes_ = indirect_commands.astype(np.uint32).tobytes()
 
     @Lazy.variable()
     @staticmethod
@@ -110,19 +129,33 @@ class VertexArray(LazyObject):
     def _attributes_buffer_() -> AttributesBuffer:
         return NotImplemented
 
+    @Lazy.variable()
+    @staticmethod
+    def _instance_attributes_buffer_() -> AttributesBuffer | None:
+        # Attributes advanced per instance rather than per vertex. Each vertex corresponds to an instance.
+        return None
+
+    @Lazy.variable()
+    @staticmethod
+    def _indirect_bytes_() -> bytes:
+        # Packed indexed draw commands, each of `(count, instance_count, first_index, base_vertex, base_instance)`.
+        return b""
+
     @Lazy.property(plural=True)
     @staticmethod
     def _macros_(
         custom_macros: tuple[str, ...],
         texture_buffers__macros: tuple[tuple[str, ...], ...],
         uniform_block_buffers__macros: tuple[tuple[str, ...], ...],
-        attributes_buffer__macros: tuple[str, ...]
+        attributes_buffer__macros: tuple[str, ...],
+        instance_attributes_buffer: AttributesBuffer | None
     ) -> tuple[str, ...]:
         return tuple(itertools.chain(
             custom_macros,
             itertools.chain.from_iterable(texture_buffers__macros),
             itertools.chain.from_iterable(uniform_block_buffers__macros),
-            attributes_buffer__macros
+            attributes_buffer__macros,
+            instance_attributes_buffer._macros_ if instance_attributes_buffer is not None else ()
         ))
 
     @Lazy.property()
@@ -175,13 +208,28 @@ class VertexArray(LazyObject):
             tess_evaluation_shader=shaders.get("TESS_EVALUATION_SHADER")
         )
 
+    @Lazy.property()
+    @staticmethod
+    def _pooled_indirect_buffer_(
+        indirect_bytes: bytes
+    ) -> PooledBuffer | None:
+        if not indirect_bytes:
+            return None
+        return Toplevel._get_context().pooled_buffer(
+            data=indirect_bytes,
+            capacity=AttributesBuffer._get_streaming_capacity(len(indirect_bytes))
+        )
+
     @Lazy.property()
     @staticmethod
     def _vertex_array_info_(
         program: moderngl.Program,
         texture_buffers: tuple[TextureBuffer, ...],
         uniform_block_buffers__field: tuple[StructuredField, ...],
-        attributes_buffer: AttributesBuffer
+        attributes_buffer: AttributesBuffer,
+        instance_attributes_buffer: AttributesBuffer | None,
+        indirect_bytes: bytes,
+        pooled_indirect_buffer: PooledBuffer | None
     ) -> VertexArrayInfo | None:
         uniform_info_dict: dict[str, ProgramUniformInfo] = {}
         uniform_block_info_dict: dict[str, ProgramUniformBlockInfo] = {}
@@ -232,30 +280,52 @@ class VertexArray(LazyObject):
                 for binding, texture in enumerate(texture_buffer._textures_, start=uniform_info.binding)
             )
 
-        uniform_block_bindings: list[tuple[str, int]] = []
-        for field in uniform_block_buffers__field:
+        uniform_block_bindings: list[tuple[int, int]] = []
+        for index, field in enumerate(uniform_block_buffers__field):
             if (uniform_block_info := uniform_block_info_dict.pop(field._name_, None)) is None:
                 continue
             uniform_block_info.verify_structured_field(field)
-            uniform_block_bindings.append((field._name_, uniform_block_info.binding))
-
-        attribute_names: list[str] = []
-        format_components: list[str] = []
-        for field, padding in zip(attributes_buffer._fields_, attributes_buffer._merged_field_._paddings_, strict=True):
-            if (attribute_info := attribute_info_dict.pop(field._name_, None)) is None:
-                if (total_padding := field._itemsize_ * field._size_ + padding):
-                    format_components.append(f"{total_padding}x")
-                continue
-            attribute_info.verify_atomic_field(field)
-            attribute_names.append(field._name_)
-            for _ in range(field._size_):
-                for _ in range(field._row_len_):
-                    format_components.append(f"{field._col_len_}{field._base_char_}{field._base_itemsize_}")
-                    if (col_padding := field._col_padding_):
-                        format_components.append(f"{col_padding}x{field._base_itemsize_}")
-            if padding:
-                format_components.append(f"{padding}x")
-        format_components.append("/v")
+            uniform_block_bindings.append((index, uniform_block_info.binding))
+
+        def get_buffer_format(
+            attributes_buffer: AttributesBuffer,
+            divisor: str
+        ) -> tuple[str, tuple[str, ...]]:
+            attribute_names: list[str] = []
+            format_components: list[str] = []
+            for field, padding in zip(attributes_buffer._fields_, attributes_buffer._merged_field_._paddings_, strict=True):
+                if (attribute_info := attribute_info_dict.pop(field._name_, None)) is None:
+                    if (total_padding := field._itemsize_ * field._size_ + padding):
+                        format_components.append(f"{total_padding}x")
+                    continue
+                attribute_info.verify_atomic_field(field)
+                attribute_names.append(field._name_)
+                if not field._col_padding_:
+                    # Moderngl expects a single format component for each attribute, including matrices and arrays.
+                    components_count = field._size_ * field._row_len_ * field._col_len_
+                    format_components.append(f"{components_count}{field._base_char_}{field._base_itemsize_}")
+                    if padding:
+                        format_components.append(f"{padding}x")
+                    continue
+                for _ in range(field._size_):
+                    for _ in range(field._row_len_):
+                        format_components.append(f"{field._col_len_}{field._base_char_}{field._base_itemsize_}")
+                        if (col_padding := field._col_padding_):
+                            format_components.append(f"{col_padding}x{field._base_itemsize_}")
+                if padding:
+                    format_components.append(f"{padding}x")
+            format_components.append(divisor)
+            return " ".join(format_components), tuple(attribute_names)
+
+        attributes_buffer_format_str, attribute_names = get_buffer_format(attributes_buffer, "/v")
+        if instance_attributes_buffer is not None:
+            instance_attributes_buffer_format_str, instance_attribute_names = get_buffer_format(
+                instance_attributes_buffer, "/i"
+            )
+            instances_count = instance_attributes_buffer._vertices_count_
+        else:
+            instance_attributes_buffer_format_str, instance_attribute_names = "", ()
+            instances_count = 1
 
         assert not uniform_info_dict
         assert not uniform_block_info_dict
@@ -265,6 +335,7 @@ class VertexArray(LazyObject):
             not attributes_buffer._vertices_count_
             or not attributes_buffer._merged_field_._itemsize_
             or attributes_buffer._use_index_buffer_ and not attributes_buffer._index_bytes_
+            or not instances_count
         ):
             return None
         return VertexArrayInfo(
@@ -273,9 +344,31 @@ class VertexArray(LazyObject):
             vertex_array=Toplevel._get_context().vertex_array(
                 program=program,
                 attributes_buffer=attributes_buffer._buffer_,
-                attributes_buffer_format_str=" ".join(format_components),
-                attribute_names=tuple(attribute_names),
+                attributes_buffer_format_str=attributes_buffer_format_str,
+                attribute_names=attribute_names,
+                instance_attributes_buffer=(
+                    instance_attributes_buffer._buffer_
+                    if instance_attributes_buffer is not None
+                    else None
+                ),
+                instance_attributes_buffer_format_str=instance_attributes_buffer_format_str,
+                instance_attribute_names=instance_attribute_names,
                 index_buffer=attributes_buffer._index_buffer_,
                 mode=attributes_buffer._primitive_mode_
-            )
+            ),
+            vertices_count=attributes_buffer._vertices_render_count_,
+            instances_count=instances_count,
+            indirect_buffer=pooled_indirect_buffer.buffer if pooled_indirect_buffer is not None else None,
+            indirect_count=len(indirect_bytes) // (5 * np.dtype(np.uint32).itemsize),
+            pooled_buffers=tuple(
+                pooled_buffer
+                for pooled_buffer in (
+                    attributes_buffer._pooled_buffer_,
+                    attributes_buffer._pooled_index_buffer_,
+                    instance_attributes_buffer._pooled_buffer_ if instance_attributes_buffer is not None else None,
+                    pooled_indirect_buffer
+                )
+                if pooled_buffer is not None
+            ),
+            sort_key=(program.glo, *(texture.glo for texture, _ in texture_bindings))
         )
@@ -2,6 +2,31 @@ layout (std140) uniform ub_camera {
     mat4 u_projection_matrix;
     mat4 u_view_matrix;
 };
+#if defined BATCHED
+// Model and graph data of every draw within a multi-draw call, indexed by draw ids.
+struct Draw {
+    mat4 model_matrix;
+    vec3 color;
+    float opacity;
+    float weight;
+    float thickness;
+};
+layout (std140) uniform ub_draws {
+    Draw u_draws[NUM_U_DRAWS];
+};
+#if defined VERTEX_SHADER
+#define DRAW_ID in_draw_id
+#elif defined GEOMETRY_SHADER
+#define DRAW_ID gs_in[0].draw_id
+#else
+#define DRAW_ID fs_in.draw_id
+#endif
+#define u_model_matrix u_draws[DRAW_ID].model_matrix
+#define u_color u_draws[DRAW_ID].color
+#define u_opacity u_draws[DRAW_ID].opacity
+#define u_weight u_draws[DRAW_ID].weight
+#define u_thickness u_draws[DRAW_ID].thickness
+#else
 layout (std140) uniform ub_model {
     mat4 u_model_matrix;
 };
@@ -11,6 +36,7 @@ layout (std140) uniform ub_graph {
     float u_weight;
     float u_thickness;
 };
+#endif
 
 
 /***********************/
@@ -19,15 +45,24 @@ layout (std140) uniform ub_graph {
 
 
 in vec3 in_position;
+#if defined BATCHED
+in int in_draw_id;
+#endif
 
 out VS_GS {
     vec3 view_position;
+    #if defined BATCHED
+    flat int draw_id;
+    #endif
 } vs_out;
 
 
 void main() {
     vec4 view_position = u_view_matrix * u_model_matrix * vec4(in_position, 1.0);
     vs_out.view_position = view_position.xyz / view_position.w;
+    #if defined BATCHED
+    vs_out.draw_id = in_draw_id;
+    #endif
 }
 
 
@@ -38,12 +73,18 @@ void main() {
 
 in VS_GS {
     vec3 view_position;
+    #if defined BATCHED
+    flat int draw_id;
+    #endif
 } gs_in[];
 
 out GS_FS {
     vec3 position_0;
     vec3 position_1;
     vec3 position_r;
+    #if defined BATCHED
+    flat int draw_id;
+    #endif
 } gs_out;
 
 
@@ -53,6 +94,9 @@ layout (triangle_strip, max_vertices = 24) out;
 
 void emit_vertex(vec3 position_r) {
     gs_out.position_r = position_r;
+    #if defined BATCHED
+    gs_out.draw_id = gs_in[0].draw_id;
+    #endif
     gl_Position = u_projection_matrix * vec4(position_r, 1.0);
     EmitVertex();
 }
@@ -138,14 +182,23 @@ in GS_FS {
     vec3 position_0;
     vec3 position_1;
     vec3 position_r;
+    #if defined BATCHED
+    flat int draw_id;
+    #endif
 } fs_in;
 
+#if defined OPAQUE
+out vec4 frag_color;
+#else
 out vec4 frag_accum;
 out float frag_revealage;
+#endif
 
 const float PI = acos(-1.0);
 
+#if !defined OPAQUE
 #include "includes/write_to_oit_frag.glsl"
+#endif
 
 
 float integate(float u) {
@@ -180,8 +233,12 @@ void main() {
     if (weight == 0.0) {
         discard;
     }
+    #if defined OPAQUE
+    frag_color = vec4(u_color, 1.0);
+    #else
     weight *= u_weight;
     write_to_oit_frag(frag_accum, frag_revealage, u_color, u_opacity, weight);
+    #endif
 }
 
 
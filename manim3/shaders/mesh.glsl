@@ -24,6 +24,33 @@ layout (std140) uniform ub_lighting {
     #endif
 };
 #endif
+#if defined BATCHED
+// Model and material data of every draw within a multi-draw call, indexed by draw ids.
+struct Draw {
+    mat4 model_matrix;
+    vec3 color;
+    float opacity;
+    float weight;
+    float ambient_strength;
+    float specular_strength;
+    float shininess;
+};
+layout (std140) uniform ub_draws {
+    Draw u_draws[NUM_U_DRAWS];
+};
+#if defined VERTEX_SHADER
+#define DRAW_ID in_draw_id
+#else
+#define DRAW_ID fs_in.draw_id
+#endif
+#define u_model_matrix u_draws[DRAW_ID].model_matrix
+#define u_color u_draws[DRAW_ID].color
+#define u_opacity u_draws[DRAW_ID].opacity
+#define u_weight u_draws[DRAW_ID].weight
+#define u_ambient_strength u_draws[DRAW_ID].ambient_strength
+#define u_specular_strength u_draws[DRAW_ID].specular_strength
+#define u_shininess u_draws[DRAW_ID].shininess
+#else
 layout (std140) uniform ub_model {
     mat4 u_model_matrix;
 };
@@ -35,6 +62,7 @@ layout (std140) uniform ub_material {
     float u_specular_strength;
     float u_shininess;
 };
+#endif
 
 
 /***********************/
@@ -45,18 +73,43 @@ layout (std140) uniform ub_material {
 in vec3 in_position;
 in vec3 in_normal;
 in vec2 in_uv;
+#if defined INSTANCED
+in mat4 in_instance_model_matrix;
+in vec3 in_instance_color;
+in float in_instance_opacity;
+#endif
+#if defined BATCHED
+in int in_draw_id;
+#endif
 
 out VS_FS {
     vec3 view_position;
     vec3 view_normal;
     vec2 uv;
+    #if defined INSTANCED
+    flat vec3 instance_color;
+    flat float instance_opacity;
+    #endif
+    #if defined BATCHED
+    flat int draw_id;
+    #endif
 } vs_out;
 
 
 void main() {
-    vec4 view_position = u_view_matrix * u_model_matrix * vec4(in_position, 1.0);
+    #if defined INSTANCED
+    mat4 model_matrix = u_model_matrix * in_instance_model_matrix;
+    vs_out.instance_color = in_instance_color;
+    vs_out.instance_opacity = in_instance_opacity;
+    #else
+    mat4 model_matrix = u_model_matrix;
+    #endif
+    #if defined BATCHED
+    vs_out.draw_id = in_draw_id;
+    #endif
+    vec4 view_position = u_view_matrix * model_matrix * vec4(in_position, 1.0);
     vs_out.view_position = view_position.xyz / view_position.w;
-    vs_out.view_normal = mat3(transpose(inverse(u_view_matrix * u_model_matrix))) * in_normal;
+    vs_out.view_normal = mat3(transpose(inverse(u_view_matrix * model_matrix))) * in_normal;
     vs_out.uv = in_uv;
     gl_Position = u_projection_matrix * view_position;
 }
@@ -71,12 +124,23 @@ in VS_FS {
     vec3 view_position;
     vec3 view_normal;
     vec2 uv;
+    #if defined INSTANCED
+    flat vec3 instance_color;
+    flat float instance_opacity;
+    #endif
+    #if defined BATCHED
+    flat int draw_id;
+    #endif
 } fs_in;
 
+#if defined OPAQUE
+out vec4 frag_color;
+#else
 out vec4 frag_accum;
 out float frag_revealage;
 
 #include "includes/write_to_oit_frag.glsl"
+#endif
 
 
 vec3 get_color_factor(vec3 view_position, vec3 view_normal) {
@@ -108,12 +172,21 @@ vec3 get_color_factor(vec3 view_position, vec3 view_normal) {
 void main() {
     vec3 color = get_color_factor(fs_in.view_position, normalize(fs_in.view_normal));
     color *= u_color;
+    float opacity = u_opacity;
+    #if defined INSTANCED
+    color *= fs_in.instance_color;
+    opacity *= fs_in.instance_opacity;
+    #endif
     #if NUM_T_COLOR_MAPS
     for (int i = 0; i < NUM_T_COLOR_MAPS; ++i) {
         color *= texture(t_color_maps[i], fs_in.uv).rgb;
     }
     #endif
-    write_to_oit_frag(frag_accum, frag_revealage, min(color, 1.0), u_opacity, u_weight);
+    #if defined OPAQUE
+    frag_color = vec4(min(color, 1.0), 1.0);
+    #else
+    write_to_oit_frag(frag_accum, frag_revealage, min(color, 1.0), opacity, u_weight);
+    #endif
 }
 
 
@@ -0,0 +1,78 @@
+uniform sampler2D t_color_map;
+
+
+/***********************/
+#if defined VERTEX_SHADER
+/***********************/
+
+
+in vec2 in_coordinates;
+
+
+void main() {
+    gl_Position = vec4(in_coordinates, 0.0, 1.0);
+}
+
+
+/***************************/
+#elif defined FRAGMENT_SHADER
+/***************************/
+
+
+layout (pixel_center_integer) in vec4 gl_FragCoord;
+
+out vec4 frag_values;
+
+
+// Rows of the color map are flipped, as images are stored from top to bottom.
+vec3 fetch_rgb(ivec2 image_coords, ivec2 size) {
+    return texelFetch(t_color_map, ivec2(image_coords.x, size.y - 1 - image_coords.y), 0).rgb;
+}
+
+
+vec3 fetch_average_rgb(ivec2 image_coords, ivec2 size) {
+    return (
+        fetch_rgb(image_coords, size)
+        + fetch_rgb(image_coords + ivec2(1, 0), size)
+        + fetch_rgb(image_coords + ivec2(0, 1), size)
+        + fetch_rgb(image_coords + ivec2(1, 1), size)
+    ) / 4.0;
+}
+
+
+void main() {
+    // Each texel packs 4 consecutive bytes, and each row of the target holds half a row of the image.
+    // Reading the target row by row thus yields planar yuv420p: the full-size Y plane,
+    // followed by the quarter-size U and V planes.
+    // Conversion follows BT.601 in limited range, as ffmpeg does by default.
+    ivec2 coords = ivec2(gl_FragCoord);
+    ivec2 size = textureSize(t_color_map, 0);
+    int half_width = size.x / 2;
+    if (coords.y < size.y * 2) {
+        ivec2 image_coords = ivec2(coords.y % 2 * half_width + coords.x * 4, coords.y / 2);
+        mat4x3 rgbs = mat4x3(
+            fetch_rgb(image_coords, size),
+            fetch_rgb(image_coords + ivec2(1, 0), size),
+            fetch_rgb(image_coords + ivec2(2, 0), size),
+            fetch_rgb(image_coords + ivec2(3, 0), size)
+        );
+        frag_values = (16.0 + 219.0 * (vec3(0.299, 0.587, 0.114) * rgbs)) / 255.0;
+        return;
+    }
+    int chroma_row = coords.y - size.y * 2;
+    int half_height = size.y / 2;
+    ivec2 image_coords = ivec2(coords.x * 4, chroma_row % half_height) * 2;
+    mat4x3 rgbs = mat4x3(
+        fetch_average_rgb(image_coords, size),
+        fetch_average_rgb(image_coords + ivec2(2, 0), size),
+        fetch_average_rgb(image_coords + ivec2(4, 0), size),
+        fetch_average_rgb(image_coords + ivec2(6, 0), size)
+    );
+    vec3 weights = chroma_row < half_height
+        ? vec3(-0.168736, -0.331264, 0.5)
+        : vec3(0.5, -0.418688, -0.081312);
+    frag_values = (128.0 + 224.0 * (weights * rgbs)) / 255.0;
+}
+
+
+#endif
@@ -113,6 +113,12 @@ class Timeline(ABC):
     ) -> None:
         pass
 
+    def _prefetch(
+        self: Self
+    ) -> None:
+        # Called when prepared, ahead of the launch.
+        pass
+
     @abstractmethod
     async def construct(
         self: Self
@@ -216,6 +222,7 @@ class Timeline(ABC):
             terminate_condition=terminate_condition
         )
         self._timeline_state.children.append(timeline)
+        timeline._prefetch()
 
     async def wait_until(
         self: Self,
@@ -3,6 +3,7 @@ from __future__ import annotations
 
 import pathlib
 import sys
+from contextlib import nullcontext
 from typing import (
     Iterator,
     Self
@@ -25,6 +26,13 @@ class Config(ToplevelResource):
     pixel_height: int = 1080
     window_pixel_height: int = 540
     msaa_samples: int = 4  # Set to 0 to disable msaa.
+    headless: bool = False  # Set to true to render offscreen through a standalone egl context, without a window.
+    draw_batching: bool = True  # Set to false to issue a draw call per mobject.
+    frustum_culling: bool = True  # Set to false to draw mobjects out of view as well.
+    culling_pixel_threshold: float = 0.0  # Mobjects projected within this many pixels in both directions are not drawn.
+    video_readback_buffers: int = 3  # Recorded frames are read back asynchronously, this many frames late.
+    video_gpu_yuv: bool | None = None  # Convert recorded frames to yuv420p on the gpu. Unset: off on software renderers like llvmpipe, where it is slower.
+    video_write_queue_size: int = 8  # Frames buffered per video ahead of ffmpeg. Rendering waits when all are in flight.
 
     default_color: ColorType = Color("white")
     default_opacity: float = 1.0
@@ -59,6 +67,9 @@ class Config(ToplevelResource):
     video_output_dir: pathlib.Path = pathlib.Path("manim3_output/videos")
     image_output_dir: pathlib.Path = pathlib.Path("manim3_output/images")
     default_filename: str = sys.argv[0].removesuffix(".py")
+    persistent_cache_size_limit: int = 1 << 30  # In bytes.
+    lazy_cache_size_limit: int = 1 << 26  # In bytes, per lazy property.
+    lazy_stats: bool = False  # Set to true to dump lazy evaluation statistics after each scene.
 
     @property
     def gl_version_code(
@@ -104,7 +115,7 @@ class Config(ToplevelResource):
         with (
             Timer(),
             Logger(),
-            Window(),
+            nullcontext() if self.headless else Window(),
             Context(),
             Renderer()
         ):
@@ -1,7 +1,9 @@
 from __future__ import annotations
 
 
+import functools
 from typing import (
+    ClassVar,
     Iterator,
     Self
 )
@@ -15,35 +17,79 @@ from ..rendering.mgl_enums import (
     ContextFlag,
     PrimitiveMode
 )
+from ..rendering.pooled_buffer import PooledBuffer
 from .toplevel import Toplevel
 from .toplevel_resource import ToplevelResource
 
 
 class Context(ToplevelResource):
-    __slots__ = ("_mgl_context",)
+    __slots__ = (
+        "_mgl_context",
+        "_buffer_pools",
+        "_buffer_pools_size",
+        "_bound_framebuffer",
+        "_bound_blendings",
+        "_bound_flag",
+        "_bound_textures",
+        "_bound_uniform_buffers",
+        "_emitted_state_calls_count",
+        "_skipped_state_calls_count"
+    )
+
+    # The number of released buffers kept for each capacity. Buffers released beyond are freed.
+    _BUFFER_POOL_SIZE: ClassVar[int] = 16
+    # The byte budget shared by all pools. Pools of capacities least recently handed back are freed first.
+    _BUFFER_POOLS_SIZE_LIMIT: ClassVar[int] = 1 << 26
 
     def __init__(
         self: Self
     ) -> None:
         super().__init__()
-        mgl_context = moderngl.create_context(
-            require=Toplevel._get_config().gl_version_code
-        )
+        # Headless contexts are created through egl, and need neither a window nor a display.
+        if Toplevel._get_config().headless:
+            mgl_context = moderngl.create_standalone_context(
+                require=Toplevel._get_config().gl_version_code,
+                backend="egl"
+            )
+        else:
+            mgl_context = moderngl.create_context(
+                require=Toplevel._get_config().gl_version_code
+            )
         mgl_context.gc_mode = "auto"
+        # Later draws win on ties, so that coplanar mobjects are layered in drawing order.
+        mgl_context.depth_func = "<="
         self._mgl_context: moderngl.Context = mgl_context
+        # Released buffers, grouped by capacity.
+        self._buffer_pools: dict[int, list[moderngl.Buffer]] = {}
+        self._buffer_pools_size: int = 0
+        # Shadow copies of gl states, so that state changes are only issued when values differ.
+        # States are assumed to be only altered through this class.
+        self._bound_framebuffer: moderngl.Framebuffer | None = None
+        self._bound_blendings: dict[int, tuple[BlendFunc, BlendFunc, BlendEquation]] = {}
+        self._bound_flag: ContextFlag | None = None
+        self._bound_textures: dict[int, moderngl.Texture] = {}
+        self._bound_uniform_buffers: dict[int, moderngl.Buffer] = {}
+        self._emitted_state_calls_count: int = 0
+        self._skipped_state_calls_count: int = 0
 
     def __contextmanager__(
         self: Self
     ) -> Iterator[None]:
         Toplevel._context = self
         yield
+        self.trim_buffer_pools()
+        self.reset_states()
         Toplevel._context = None
 
     def set_blendings(
         self: Self,
         blendings: tuple[tuple[BlendFunc, BlendFunc, BlendEquation], ...]
     ) -> None:
-        for index, (src_blend_func, dst_blend_func, blend_equation) in enumerate(blendings):
+        for index, blending in enumerate(blendings):
+            if self._bound_blendings.get(index) == blending:
+                self._skipped_state_calls_count += 2
+                continue
+            src_blend_func, dst_blend_func, blend_equation = blending
             gl.glBlendFunci(
                 index,
                 src_blend_func.value,
@@ -53,12 +99,72 @@ class Context(ToplevelResource):
                 index,
                 blend_equation.value
             )
+            self._bound_blendings[index] = blending
+            self._emitted_state_calls_count += 2
+
+    def use_framebuffer(
+        self: Self,
+        framebuffer: moderngl.Framebuffer
+    ) -> None:
+        if self._bound_framebuffer is framebuffer:
+            self._skipped_state_calls_count += 1
+            return
+        framebuffer.use()
+        self._bound_framebuffer = framebuffer
+        self._emitted_state_calls_count += 1
 
     def set_flag(
         self: Self,
         flag: ContextFlag
     ) -> None:
+        if self._bound_flag is flag:
+            self._skipped_state_calls_count += 1
+            return
         self._mgl_context.enable_only(flag.value)
+        self._bound_flag = flag
+        self._emitted_state_calls_count += 1
+
+    def use_texture(
+        self: Self,
+        texture: moderngl.Texture,
+        binding: int
+    ) -> None:
+        if self._bound_textures.get(binding) is texture:
+            self._skipped_state_calls_count += 1
+            return
+        texture.use(binding)
+        self._bound_textures[binding] = texture
+        self._emitted_state_calls_count += 1
+
+    def bind_uniform_buffer(
+        self: Self,
+        buffer: moderngl.Buffer,
+        binding: int
+    ) -> None:
+        # Buffers are always bound in full range. Orphaning or rewriting a buffer keeps the binding valid.
+        if self._bound_uniform_buffers.get(binding) is buffer:
+            self._skipped_state_calls_count += 1
+            return
+        buffer.bind_to_uniform_block(binding)
+        self._bound_uniform_buffers[binding] = buffer
+        self._emitted_state_calls_count += 1
+
+    def reset_states(
+        self: Self
+    ) -> None:
+        # Forget shadow states, typically after gl states are altered out of this class.
+        self._bound_framebuffer = None
+        self._bound_blendings.clear()
+        self._bound_flag = None
+        self._bound_textures.clear()
+        self._bound_uniform_buffers.clear()
+
+    @property
+    def state_calls_counts(
+        self: Self
+    ) -> tuple[int, int]:
+        # Numbers of state-changing gl calls emitted and skipped.
+        return self._emitted_state_calls_count, self._skipped_state_calls_count
 
     @property
     def version_code(
@@ -66,6 +172,19 @@ class Context(ToplevelResource):
     ) -> int:
         return self._mgl_context.version_code
 
+    @property
+    def max_uniform_block_size(
+        self: Self
+    ) -> int:
+        return self._mgl_context.info["GL_MAX_UNIFORM_BLOCK_SIZE"]
+
+    @property
+    def is_software_renderer(
+        self: Self
+    ) -> bool:
+        renderer = self._mgl_context.info["GL_RENDERER"].lower()
+        return any(name in renderer for name in ("llvmpipe", "softpipe", "swrast", "swiftshader"))
+
     @property
     def screen_framebuffer(
         self: Self
@@ -87,21 +206,101 @@ class Context(ToplevelResource):
             dtype=dtype
         )
 
+    def depth_texture(
+        self: Self,
+        *,
+        size: tuple[int, int],
+        samples: int
+    ) -> moderngl.Texture:
+        return self._mgl_context.depth_texture(
+            size=size,
+            samples=samples
+        )
+
     def framebuffer(
         self: Self,
         *,
-        color_attachments: tuple[moderngl.Texture, ...]
+        color_attachments: tuple[moderngl.Texture, ...],
+        depth_attachment: moderngl.Texture | None = None
     ) -> moderngl.Framebuffer:
         return self._mgl_context.framebuffer(
-            color_attachments=color_attachments
+            color_attachments=color_attachments,
+            depth_attachment=depth_attachment
         )
 
+    def clear_framebuffer(
+        self: Self,
+        framebuffer: moderngl.Framebuffer,
+        *,
+        color: tuple[float, float, float, float] | None = None
+    ) -> None:
+        # Moderngl binds the framebuffer and applies its masks when clearing, behind the shadow states.
+        framebuffer.clear(color=color)
+        self._bound_framebuffer = None
+
     def buffer(
         self: Self,
         *,
-        data: bytes
+        data: bytes | bytearray | None = None,
+        reserve: int = 0
     ) -> moderngl.Buffer:
-        return self._mgl_context.buffer(data=data)
+        return self._mgl_context.buffer(
+            data=data,
+            reserve=reserve
+        )
+
+    def pooled_buffer(
+        self: Self,
+        *,
+        data: bytes | bytearray,
+        capacity: int | None = None
+    ) -> PooledBuffer:
+        # Reuse a released buffer of the same capacity if any, avoiding allocations of gl buffers.
+        # The previous storage is orphaned, so that pending draw calls are not stalled by the write.
+        if capacity is None:
+            capacity = len(data)
+        assert capacity >= len(data)
+        if pool := self._buffer_pools.get(capacity):
+            buffer = pool.pop()
+            self._buffer_pools_size -= buffer.size
+            buffer.orphan()
+        else:
+            buffer = self._mgl_context.buffer(reserve=max(capacity, 1))
+        buffer.write(data)
+        return PooledBuffer(buffer, functools.partial(self._recycle_buffer, capacity))
+
+    def _recycle_buffer(
+        self: Self,
+        capacity: int,
+        buffer: moderngl.Buffer
+    ) -> None:
+        # Buffers handed back after the context exits, or into a full pool, are freed right away.
+        # Capacities grow with data, so pools of capacities no longer in use are left behind.
+        # Pools are ordered by recency, and the stale ones are freed first once over the budget.
+        buffer_pools = self._buffer_pools
+        pool = buffer_pools.pop(capacity, [])
+        buffer_pools[capacity] = pool
+        if Toplevel._context is not self or len(pool) >= type(self)._BUFFER_POOL_SIZE:
+            buffer.release()
+            return
+        pool.append(buffer)
+        self._buffer_pools_size += buffer.size
+        while self._buffer_pools_size > type(self)._BUFFER_POOLS_SIZE_LIMIT:
+            stale_capacity, stale_pool = next(iter(buffer_pools.items()))
+            stale_buffer = stale_pool.pop()
+            self._buffer_pools_size -= stale_buffer.size
+            stale_buffer.release()
+            if not stale_pool:
+                del buffer_pools[stale_capacity]
+
+    def trim_buffer_pools(
+        self: Self
+    ) -> None:
+        for pool in self._buffer_pools.values():
+            for buffer in pool:
+                buffer.release()
+        self._buffer_pools.clear()
+        self._buffer_pools_size = 0
 
     def program(
         self: Self,
@@ -129,12 +328,17 @@ class Context(ToplevelResource):
         attributes_buffer: moderngl.Buffer,
         attributes_buffer_format_str: str,
         attribute_names: tuple[str, ...],
+        instance_attributes_buffer: moderngl.Buffer | None = None,
+        instance_attributes_buffer_format_str: str = "",
+        instance_attribute_names: tuple[str, ...] = (),
         index_buffer: moderngl.Buffer | None,
         mode: PrimitiveMode
     ) -> moderngl.VertexArray:
         content = []
         if attribute_names:
             content.append((attributes_buffer, attributes_buffer_format_str, *attribute_names))
+        if instance_attributes_buffer is not None and instance_attribute_names:
+            content.append((instance_attributes_buffer, instance_attributes_buffer_format_str, *instance_attribute_names))
         return self._mgl_context.vertex_array(
             program=program,
             content=content,
@@ -143,25 +347,17 @@ class Context(ToplevelResource):
             mode=mode.value
         )
 
-    def scope(
-        self: Self,
-        *,
-        framebuffer: moderngl.Framebuffer | None = None,
-        textures: tuple[tuple[moderngl.Texture, int], ...] = (),
-        uniform_buffers: tuple[tuple[moderngl.Buffer, int], ...] = ()
-    ) -> moderngl.Scope:
-        return self._mgl_context.scope(
-            framebuffer=framebuffer,
-            textures=textures,
-            uniform_buffers=uniform_buffers
-        )
-
     def blit_framebuffer(
         self: Self,
         *,
         dst: moderngl.Framebuffer,
         src: moderngl.Framebuffer
     ) -> None:
+        # Frames of equal sizes are copied through moderngl, as no pyglet context exists in headless mode.
+        if dst.size == src.size:
+            self._mgl_context.copy_framebuffer(dst=dst, src=src)
+            self._bound_framebuffer = None
+            return
         # Moderngl `copy_framebuffer` does not support unequal frame sizes.
         # This method is a simple patch for such requirement.
         gl.glBindFramebuffer(gl.GL_READ_FRAMEBUFFER, src.glo)
@@ -170,3 +366,4 @@ class Context(ToplevelResource):
             *src.viewport, *dst.viewport,
             gl.GL_COLOR_BUFFER_BIT, gl.GL_LINEAR
         )
+        self._bound_framebuffer = None
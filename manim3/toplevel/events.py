@@ -81,7 +81,9 @@ class Event:
     def captured(
         self: Self
     ) -> bool:
-        return self._captured_event_info is not None or Toplevel._get_window().capture_event_info_by(self)
+        return self._captured_event_info is not None or (
+            (window := Toplevel._window) is not None and window.capture_event_info_by(self)
+        )
 
     def get_captured_event_info(
         self: Self
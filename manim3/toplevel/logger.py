@@ -9,27 +9,33 @@ from typing import (
 )
 
 import rich.box
+import rich.console
 import rich.live
 import rich.table
 
+from ..lazy.lazy_descriptor import LazyStats
 from .toplevel import Toplevel
 from .toplevel_resource import ToplevelResource
 
 
 class Logger(ToplevelResource):
-    __slots__ = ("_log_messages",)
+    __slots__ = (
+        "_log_messages",
+        "_console"
+    )
 
     def __init__(
         self: Self
     ) -> None:
         super().__init__()
         self._log_messages: collections.deque[str] = collections.deque(maxlen=10)
+        self._console: rich.console.Console = rich.console.Console()
 
     def __contextmanager__(
         self: Self
     ) -> Iterator[None]:
         Toplevel._logger = self
-        with rich.live.Live(vertical_overflow="crop", get_renderable=self._get_table):
+        with rich.live.Live(vertical_overflow="crop", get_renderable=self._get_table, console=self._console):
             yield
         Toplevel._logger = None
 
@@ -71,6 +77,7 @@ class Logger(ToplevelResource):
             return f"{minutes}:{seconds:02}"
 
         timer = Toplevel._get_timer()
+        context = Toplevel._context
         renderer = Toplevel._renderer
         scene = Toplevel._scene
         status_dict = {
@@ -78,8 +85,14 @@ class Logger(ToplevelResource):
             "FPS": f"{timer._recorded_fps}",
             "Livestream": "-" if renderer is None else "[green]On" if renderer._livestreamer.is_livestreaming else "[red]Off",
             "Recording": "-" if renderer is None else "[green]On" if renderer._video_recorder.is_recording else "[red]Off",
+            "Write Queue": "-" if renderer is None else "/".join(map(str, renderer._video_recorder.queue_fill)),
+            "Write Stalls": "-" if renderer is None else f"{renderer._video_recorder.stall_time:.2f} s",
             "Scene Name": "-" if scene is None else type(scene).__name__,
-            "Scene Time": "-" if scene is None else format_duration(scene._scene_time)
+            "Scene Time": "-" if scene is None else format_duration(scene._scene_time),
+            "Mobjects Culled": "-" if renderer is None else f"{renderer.cull_counts[0]}",
+            "Mobjects Drawn": "-" if renderer is None else f"{renderer.cull_counts[1]}",
+            "GL Calls Emitted": "-" if context is None else f"{context.state_calls_counts[0]}",
+            "GL Calls Skipped": "-" if context is None else f"{context.state_calls_counts[1]}"
         }
 
         status_table = rich.table.Table.grid(
@@ -96,3 +109,38 @@ class Logger(ToplevelResource):
         message: str
     ) -> None:
         self._log_messages.append(message)
+
+    def print_lazy_stats(
+        self: Self,
+        title: str,
+        stats: tuple[LazyStats, ...]
+    ) -> None:
+        stats_table = rich.table.Table(
+            rich.table.Column(header="Descriptor", no_wrap=True, overflow="ellipsis"),
+            rich.table.Column(header="Hits", justify="right"),
+            rich.table.Column(header="Reuses", justify="right"),
+            rich.table.Column(header="LRU Hits", justify="right"),
+            rich.table.Column(header="LRU Misses", justify="right"),
+            rich.table.Column(header="Calls", justify="right"),
+            rich.table.Column(header="Time (ms)", justify="right"),
+            rich.table.Column(header="Expired", justify="right"),
+            rich.table.Column(header="Memoized (KiB)", justify="right"),
+            rich.table.Column(header="Cached (KiB)", justify="right"),
+            title=f"Lazy Stats ({title})",
+            box=rich.box.ASCII
+        )
+        for descriptor_stats in stats:
+            stats_table.add_row(
+                descriptor_stats.name,
+                f"{descriptor_stats.hit_count}",
+                f"{descriptor_stats.reuse_count}",
+                f"{descriptor_stats.lru_hit_count}",
+                f"{descriptor_stats.lru_miss_count}",
+                f"{descriptor_stats.call_count}",
+                f"{descriptor_stats.compute_time * 1000.0:.1f}",
+                f"{descriptor_stats.invalidation_count}",
+                f"{descriptor_stats.memoized_bytes / 1024.0:.1f}",
+                f"{descriptor_stats.cached_bytes / 1024.0:.1f}"
+            )
+        # Printed above the live display.
+        self._console.print(stats_table)
@@ -1,8 +1,13 @@
 from __future__ import annotations
 
 
+import collections
+import itertools
 import pathlib
+import queue
 import subprocess
+import threading
+import time
 from typing import (
     IO,
     Iterator,
@@ -10,13 +15,23 @@ from typing import (
 )
 
 import ffmpeg
+import moderngl
 import numpy as np
 from PIL import Image
 
+from ..animatables.camera import Camera
+from ..constants.custom_typing import NP_x3f8
+from ..lazy.lazy_cache import LazyCache
+from ..lazy.lazy_persistence import LazyPersistence
+from ..mobjects.mobject import Mobject
 from ..rendering.buffers.attributes_buffer import AttributesBuffer
 from ..rendering.buffers.texture_buffer import TextureBuffer
+from ..rendering.buffers.uniform_block_buffer import UniformBlockBuffer
+from ..rendering.draw_batcher import DrawBatcher
 from ..rendering.framebuffers.final_framebuffer import FinalFramebuffer
 from ..rendering.framebuffers.oit_framebuffer import OITFramebuffer
+from ..rendering.framebuffers.opaque_framebuffer import OpaqueFramebuffer
+from ..rendering.framebuffers.yuv_framebuffer import YUVFramebuffer
 from ..rendering.mgl_enums import PrimitiveMode
 from ..rendering.vertex_array import VertexArray
 from .toplevel import Toplevel
@@ -28,25 +43,35 @@ class VideoPipe:
         "_video_path",
         "_video_stream",
         "_writing_process",
-        "_writing"
+        "_writing",
+        "_queue_size",
+        "_frame_queue",
+        "_free_frames",
+        "_writer_thread",
+        "_writer_error",
+        "_stall_time"
     )
 
     def __init__(
         self: Self,
-        video_path: pathlib.Path
+        video_path: pathlib.Path,
+        pixel_format: str,
+        frame_size: int
     ) -> None:
         super().__init__()
         pixel_width, pixel_height = Toplevel._get_config().pixel_size
+        input_stream = ffmpeg.input(
+            filename="pipe:",
+            format="rawvideo",
+            pix_fmt=pixel_format,
+            s=f"{pixel_width}x{pixel_height}",
+            framerate=Toplevel._get_config().fps
+        )
+        # Rgb frames are read bottom-up, while yuv frames are already flipped on the gpu.
+        if pixel_format == "rgb24":
+            input_stream = input_stream.vflip()
         writing_process = (
-            ffmpeg
-            .input(
-                filename="pipe:",
-                format="rawvideo",
-                pix_fmt="rgb24",
-                s=f"{pixel_width}x{pixel_height}",
-                framerate=Toplevel._get_config().fps
-            )
-            .vflip()
+            input_stream
             .output(
                 filename=video_path,
                 pix_fmt="yuv420p",
@@ -57,10 +82,23 @@ class VideoPipe:
                 overwrite_output=True
             )
         )
+        # Frames are copied into preallocated buffers and written to ffmpeg on a dedicated thread,
+        # so that a slow encoder only blocks rendering once all buffers are in flight.
+        queue_size = max(Toplevel._get_config().video_write_queue_size, 1)
+        free_frames: queue.SimpleQueue[bytearray] = queue.SimpleQueue()
+        for _ in range(queue_size):
+            free_frames.put(bytearray(frame_size))
         self._video_path: pathlib.Path = video_path
         self._video_stream: IO[bytes] = writing_process.stdin
         self._writing_process: subprocess.Popen[bytes] = writing_process
         self._writing: bool = False
+        self._queue_size: int = queue_size
+        self._frame_queue: queue.SimpleQueue[bytearray | None] = queue.SimpleQueue()
+        self._free_frames: queue.SimpleQueue[bytearray] = free_frames
+        self._writer_thread: threading.Thread = threading.Thread(target=self._write_frames, daemon=True)
+        self._writer_error: Exception | None = None
+        self._stall_time: float = 0.0
+        self._writer_thread.start()
 
     @property
     def is_writing(
@@ -68,6 +106,20 @@ class VideoPipe:
     ) -> bool:
         return self._writing
 
+    @property
+    def queue_fill(
+        self: Self
+    ) -> tuple[int, int]:
+        # Numbers of frames waiting for ffmpeg, and of frame buffers.
+        return self._queue_size - self._free_frames.qsize(), self._queue_size
+
+    @property
+    def stall_time(
+        self: Self
+    ) -> float:
+        # Total time spent waiting for a free frame buffer, in seconds.
+        return self._stall_time
+
     def enable_writing(
         self: Self
     ) -> None:
@@ -84,16 +136,41 @@ class VideoPipe:
         self._writing = False
         Toplevel._get_logger().log(f"Stop recording video to '{self._video_path}'.")
 
+    def _write_frames(
+        self: Self
+    ) -> None:
+        while (frame := self._frame_queue.get()) is not None:
+            # Once writing fails, frames are still consumed so that the renderer never waits forever.
+            # The error is raised when the video is saved.
+            if self._writer_error is None:
+                try:
+                    self._video_stream.write(frame)
+                except Exception as error:
+                    self._writer_error = error
+            self._free_frames.put(frame)
+
     def write(
         self: Self,
-        data: bytes
+        data: memoryview
     ) -> None:
-        self._video_stream.write(data)
+        try:
+            frame = self._free_frames.get_nowait()
+        except queue.Empty:
+            stall_start = time.perf_counter()
+            frame = self._free_frames.get()
+            self._stall_time += time.perf_counter() - stall_start
+        frame[:] = data
+        self._frame_queue.put(frame)
 
     def save(
         self: Self
     ) -> None:
+        # Ffmpeg is always waited for, so that no process is left behind.
+        self._frame_queue.put(None)
+        self._writer_thread.join()
         self._writing_process.communicate()
+        if self._writer_error is not None:
+            raise self._writer_error
         Toplevel._get_logger().log(f"Recording saved to '{self._video_path}'.")
 
 
@@ -113,6 +190,11 @@ class CacheStorager:
         output_dir.mkdir(exist_ok=True)
         temp_dir.mkdir(exist_ok=True)
         cache_dir.mkdir(exist_ok=True)
+        LazyPersistence.enable(
+            storage_dir=cache_dir.joinpath("lazy"),
+            size_limit=Toplevel._get_config().persistent_cache_size_limit
+        )
+        LazyCache.set_size_limit(Toplevel._get_config().lazy_cache_size_limit)
         self._cache_dir: pathlib.Path = cache_dir
         self._temp_dir: pathlib.Path = temp_dir
 
@@ -149,6 +231,9 @@ class Livestreamer:
     ) -> None:
         if self._livestreaming:
             return
+        if Toplevel._get_config().headless:
+            Toplevel._get_logger().log("Livestreaming is unavailable in headless mode.")
+            return
         self._livestreaming = True
         Toplevel._get_logger().log("Start livestreaming.")
 
@@ -174,17 +259,78 @@ class Livestreamer:
 class VideoRecorder:
     __slots__ = (
         "_video_dir",
-        "_video_pipes"
+        "_video_pipes",
+        "_framebuffer",
+        "_yuv_framebuffer",
+        "_yuv_convert_vertex_array",
+        "_pixel_format",
+        "_frame_size",
+        "_pixel_pack_buffers",
+        "_pending_frames",
+        "_frame_data"
     )
 
     def __init__(
-        self: Self
+        self: Self,
+        framebuffer: FinalFramebuffer
     ) -> None:
         super().__init__()
         video_dir = Toplevel._get_config().video_output_dir
         video_dir.mkdir(exist_ok=True)
+        pixel_width, pixel_height = Toplevel._get_config().pixel_size
+        # Frames of widths divisible by 8 and even heights are converted to yuv420p on the gpu, halving the data to read back,
+        # and saving ffmpeg a flip and a color conversion.
+        if (video_gpu_yuv := Toplevel._get_config().video_gpu_yuv) is None:
+            video_gpu_yuv = not Toplevel._get_context().is_software_renderer
+        if video_gpu_yuv and pixel_width % 8 == 0 and pixel_height % 2 == 0:
+            yuv_framebuffer = YUVFramebuffer()
+            yuv_convert_vertex_array = VertexArray(
+                shader_filename="yuv_convert.glsl",
+                texture_buffers=(
+                    TextureBuffer(
+                        name="t_color_map",
+                        textures=framebuffer.get_attachment("")
+                    ),
+                ),
+                attributes_buffer=AttributesBuffer(
+                    field_declarations=(
+                        "vec2 in_coordinates",
+                    ),
+                    data_dict={
+                        "in_coordinates": np.array((
+                            (-1.0, -1.0),
+                            (1.0, -1.0),
+                            (1.0, 1.0),
+                            (-1.0, 1.0)
+                        ))
+                    },
+                    primitive_mode=PrimitiveMode.TRIANGLE_FAN,
+                    vertices_count=4
+                )
+            )
+            pixel_format = "yuv420p"
+            frame_size = pixel_width * pixel_height * 3 // 2
+        else:
+            yuv_framebuffer = None
+            yuv_convert_vertex_array = None
+            pixel_format = "rgb24"
+            frame_size = pixel_width * pixel_height * 3
         self._video_dir: pathlib.Path = video_dir
         self._video_pipes: dict[str, VideoPipe] = {}
+        self._framebuffer: FinalFramebuffer = framebuffer
+        self._yuv_framebuffer: YUVFramebuffer | None = yuv_framebuffer
+        self._yuv_convert_vertex_array: VertexArray | None = yuv_convert_vertex_array
+        self._pixel_format: str = pixel_format
+        self._frame_size: int = frame_size
+        # Frames are read into pixel pack buffers without waiting for the gpu,
+        # and only mapped back once the buffer is about to be reused, several frames later.
+        self._pixel_pack_buffers: tuple[moderngl.Buffer, ...] = tuple(
+            Toplevel._get_context().buffer(reserve=frame_size)
+            for _ in range(max(Toplevel._get_config().video_readback_buffers, 1))
+        )
+        # Each pending frame remembers the pipes writing at the time it is rendered.
+        self._pending_frames: collections.deque[tuple[moderngl.Buffer, tuple[VideoPipe, ...]]] = collections.deque()
+        self._frame_data: memoryview = memoryview(bytearray(frame_size))
 
     @property
     def is_recording(
@@ -192,6 +338,19 @@ class VideoRecorder:
     ) -> bool:
         return any(video_pipe.is_writing for video_pipe in self._video_pipes.values())
 
+    @property
+    def queue_fill(
+        self: Self
+    ) -> tuple[int, int]:
+        fills = tuple(video_pipe.queue_fill for video_pipe in self._video_pipes.values())
+        return sum(fill for fill, _ in fills), sum(size for _, size in fills)
+
+    @property
+    def stall_time(
+        self: Self
+    ) -> float:
+        return sum(video_pipe.stall_time for video_pipe in self._video_pipes.values())
+
     def enable_recording(
         self: Self,
         filename: str
@@ -200,7 +359,11 @@ class VideoRecorder:
             video_path = self._video_dir.joinpath(filename)
             assert video_path.suffix == ".mp4", \
                 f"Video format other than .mp4 is currently not supported: {video_path.suffix}"
-            video_pipe = VideoPipe(video_path)
+            video_pipe = VideoPipe(
+                video_path=video_path,
+                pixel_format=self._pixel_format,
+                frame_size=self._frame_size
+            )
             self._video_pipes[filename] = video_pipe
         video_pipe.enable_writing()
 
@@ -212,20 +375,48 @@ class VideoRecorder:
             raise ValueError(f"Video pipe to {filename} not found.")
         video_pipe.disable_writing()
 
+    def _write_pending_frame(
+        self: Self
+    ) -> moderngl.Buffer:
+        pixel_pack_buffer, video_pipes = self._pending_frames.popleft()
+        pixel_pack_buffer.read_into(self._frame_data)
+        for video_pipe in video_pipes:
+            video_pipe.write(self._frame_data)
+        return pixel_pack_buffer
+
     def record_frame(
-        self: Self,
-        framebuffer: FinalFramebuffer
+        self: Self
     ) -> None:
-        frame_bytes = framebuffer._framebuffer.read()
-        for video_pipe in self._video_pipes.values():
-            if video_pipe.is_writing:
-                video_pipe.write(frame_bytes)
+        if len(self._pending_frames) == len(self._pixel_pack_buffers):
+            pixel_pack_buffer = self._write_pending_frame()
+        else:
+            pixel_pack_buffer = self._pixel_pack_buffers[len(self._pending_frames)]
+        if (yuv_framebuffer := self._yuv_framebuffer) is not None:
+            assert (yuv_convert_vertex_array := self._yuv_convert_vertex_array) is not None
+            yuv_framebuffer.render(yuv_convert_vertex_array)
+            yuv_framebuffer._framebuffer.read_into(pixel_pack_buffer, components=4)
+        else:
+            self._framebuffer._framebuffer.read_into(pixel_pack_buffer, components=3)
+        self._pending_frames.append((pixel_pack_buffer, tuple(
+            video_pipe for video_pipe in self._video_pipes.values()
+            if video_pipe.is_writing
+        )))
 
     def save_videos(
         self: Self
     ) -> None:
+        # Every video is saved even if some fail. The first error is raised afterwards.
+        while self._pending_frames:
+            self._write_pending_frame()
+        first_error: Exception | None = None
         for video_pipe in self._video_pipes.values():
-            video_pipe.save()
+            try:
+                video_pipe.save()
+            except Exception as error:
+                if first_error is None:
+                    first_error = error
+        if first_error is not None:
+            raise first_error
 
 
 class ImageRecoder:
@@ -257,8 +448,15 @@ class ImageRecoder:
 class Renderer(ToplevelResource):
     __slots__ = (
         "_final_framebuffer",
+        "_opaque_framebuffer",
         "_oit_framebuffer",
         "_oit_compose_vertex_array",
+        "_draw_mobjects_key",
+        "_draw_mobjects",
+        "_culled_count",
+        "_drawn_count",
+        "_opaque_draw_batcher",
+        "_translucent_draw_batcher",
         "_cache_storager",
         "_livestreamer",
         "_video_recorder",
@@ -272,7 +470,11 @@ class Renderer(ToplevelResource):
 
         msaa_samples = Toplevel._get_config().msaa_samples
         final_framebuffer = FinalFramebuffer()
-        oit_framebuffer = OITFramebuffer(samples=msaa_samples)
+        opaque_framebuffer = OpaqueFramebuffer(samples=msaa_samples)
+        oit_framebuffer = OITFramebuffer(
+            samples=msaa_samples,
+            depth_attachment=opaque_framebuffer.get_depth_attachment()
+        )
         oit_compose_vertex_array = VertexArray(
             shader_filename="oit_compose.glsl",
             custom_macros=(
@@ -306,11 +508,22 @@ class Renderer(ToplevelResource):
         )
 
         self._final_framebuffer: FinalFramebuffer = final_framebuffer
+        self._opaque_framebuffer: OpaqueFramebuffer = opaque_framebuffer
         self._oit_framebuffer: OITFramebuffer = oit_framebuffer
         self._oit_compose_vertex_array: VertexArray = oit_compose_vertex_array
+        self._draw_mobjects_key: tuple[Mobject, int] | None = None
+        self._draw_mobjects: tuple[Mobject, ...] = ()
+        self._culled_count: int = 0
+        self._drawn_count: int = 0
+        # Multi-draw-indirect calls are core since OpenGL 4.3.
+        # Each pass keeps its own batcher, as batches are retained across frames.
+        # The opaque pass keeps draw order, as later draws win depth ties between coplanar mobjects.
+        draw_batching = Toplevel._get_config().draw_batching and Toplevel._get_context().version_code >= 430
+        self._opaque_draw_batcher: DrawBatcher | None = DrawBatcher(preserve_order=True) if draw_batching else None
+        self._translucent_draw_batcher: DrawBatcher | None = DrawBatcher() if draw_batching else None
         self._cache_storager: CacheStorager = CacheStorager()
         self._livestreamer: Livestreamer = Livestreamer()
-        self._video_recorder: VideoRecorder = VideoRecorder()
+        self._video_recorder: VideoRecorder = VideoRecorder(final_framebuffer)
         self._image_recoder: ImageRecoder = ImageRecoder()
 
     def __contextmanager__(
@@ -319,25 +532,129 @@ class Renderer(ToplevelResource):
         Toplevel._renderer = self
         yield
         self._video_recorder.save_videos()
+        LazyPersistence.disable()
         Toplevel._renderer = None
 
+    def _get_draw_mobjects(
+        self: Self,
+        root_mobject: Mobject
+    ) -> tuple[Mobject, ...]:
+        # The flattened list of renderable mobjects is only rebuilt when families change.
+        # Vertex arrays and uniform block buffers are still fetched every frame, as cheap lazy reads.
+        if self._draw_mobjects_key != (key := (root_mobject, Mobject._family_version)):
+            self._draw_mobjects_key = key
+            self._draw_mobjects = tuple(
+                mobject for mobject in root_mobject.iter_descendants()
+                if type(mobject)._iter_vertex_arrays is not Mobject._iter_vertex_arrays
+            )
+        return self._draw_mobjects
+
+    def _cull_draw_mobjects(
+        self: Self,
+        draw_mobjects: tuple[Mobject, ...]
+    ) -> tuple[Mobject, ...]:
+        # Render bounds are tested against cameras in bulk. Mobjects without bounds are kept.
+        config = Toplevel._get_config()
+        if not config.frustum_culling:
+            self._culled_count = 0
+            self._drawn_count = len(draw_mobjects)
+            return draw_mobjects
+
+        draw_count = len(draw_mobjects)
+        render_bounds_tuple = tuple(mobject._render_bounds_ for mobject in draw_mobjects)
+        cameras = tuple(mobject._camera_ for mobject in draw_mobjects)
+        bounded_mask = np.fromiter(map(len, render_bounds_tuple), dtype=np.bool_, count=draw_count)
+        bounds = np.zeros((draw_count, 2, 3))
+        if bounded_mask.any():
+            bounds[bounded_mask] = tuple(itertools.compress(render_bounds_tuple, bounded_mask))
+        visible_mask = np.ones((draw_count,), dtype=np.bool_)
+        for camera in dict.fromkeys(cameras):
+            camera_mask = bounded_mask & np.fromiter(
+                (mobject_camera is camera for mobject_camera in cameras),
+                dtype=np.bool_,
+                count=draw_count
+            )
+            visible_mask[camera_mask] = type(self)._get_visible_mask(
+                camera=camera,
+                maxima=bounds[camera_mask, 0],
+                minima=bounds[camera_mask, 1],
+                pixel_threshold=config.culling_pixel_threshold
+            )
+        visible_mobjects = tuple(itertools.compress(draw_mobjects, visible_mask))
+        self._culled_count = len(draw_mobjects) - len(visible_mobjects)
+        self._drawn_count = len(visible_mobjects)
+        return visible_mobjects
+
+    @classmethod
+    def _get_visible_mask(
+        cls: type[Self],
+        camera: Camera,
+        maxima: NP_x3f8,
+        minima: NP_x3f8,
+        pixel_threshold: float
+    ) -> np.ndarray:
+        # A box is culled if all its corners lie outside a same clipping plane,
+        # or if it lies in front of the camera and its projection is smaller than the threshold.
+        corner_selectors = np.array(tuple(itertools.product((0, 1), repeat=3)))
+        corners = np.stack((minima, maxima), axis=1)[:, corner_selectors, np.arange(3)]
+        matrix = camera._projection_matrix_ @ camera._view_matrix_
+        clip_positions = corners @ matrix[:, :3].T + matrix[:, 3]
+        w = clip_positions[..., 3]
+        visible_mask = np.ones((len(corners),), dtype=np.bool_)
+        for axis in range(3):
+            coordinates = clip_positions[..., axis]
+            visible_mask &= ~np.all(coordinates > w, axis=1)
+            visible_mask &= ~np.all(coordinates < -w, axis=1)
+        if pixel_threshold > 0.0:
+            in_front_mask = np.all(w > 0.0, axis=1)
+            ndc_positions = clip_positions[..., :2] / np.where(in_front_mask[:, None], w, 1.0)[..., None]
+            pixel_extents = (ndc_positions.max(axis=1) - ndc_positions.min(axis=1)) \
+                * np.array(Toplevel._get_config().pixel_size) / 2.0
+            visible_mask &= ~(in_front_mask & np.all(pixel_extents < pixel_threshold, axis=1))
+        return visible_mask
+
+    @property
+    def cull_counts(
+        self: Self
+    ) -> tuple[int, int]:
+        # Numbers of mobjects culled and drawn in the last frame.
+        return self._culled_count, self._drawn_count
+
     def _render_frame(
         self: Self
     ) -> None:
         scene = Toplevel._get_scene()
 
-        self._oit_framebuffer.clear()
-        for mobject in scene._root_mobject.iter_descendants():
-            for vertex_array in mobject._iter_vertex_arrays():
-                self._oit_framebuffer.render(vertex_array)
+        # Opaque mobjects are drawn with depth tests, so that hidden fragments are rejected early.
+        # Translucent ones go through order-independent transparency, tested against opaque depths,
+        # and are composed onto the resolved opaque pass. The composition is skipped if nothing is translucent.
+        opaque_draw_items: list[tuple[VertexArray, tuple[UniformBlockBuffer, ...]]] = []
+        translucent_draw_items: list[tuple[VertexArray, tuple[UniformBlockBuffer, ...]]] = []
+        for mobject in self._cull_draw_mobjects(self._get_draw_mobjects(scene._root_mobject)):
+            (translucent_draw_items if mobject._translucent_ else opaque_draw_items).extend(
+                mobject._iter_vertex_arrays()
+            )
+        if self._opaque_draw_batcher is not None:
+            opaque_draw_items = list(self._opaque_draw_batcher.batch(opaque_draw_items))
+        if self._translucent_draw_batcher is not None:
+            translucent_draw_items = list(self._translucent_draw_batcher.batch(translucent_draw_items))
+
+        self._opaque_framebuffer.clear(color=(*scene._background_color, scene._background_opacity))
+        self._opaque_framebuffer.render_all(opaque_draw_items)
+        Toplevel._get_context().blit_framebuffer(
+            dst=self._final_framebuffer._framebuffer,
+            src=self._opaque_framebuffer._framebuffer
+        )
 
-        self._final_framebuffer.clear(color=(*scene._background_color, scene._background_opacity))
-        self._final_framebuffer.render(self._oit_compose_vertex_array)
+        if translucent_draw_items:
+            self._oit_framebuffer.clear()
+            self._oit_framebuffer.render_all(translucent_draw_items)
+            self._final_framebuffer.render(self._oit_compose_vertex_array)
 
     def process_frame(
         self: Self
     ) -> None:
-        if Toplevel._get_window()._pyglet_window.context is None:
+        if (window := Toplevel._window) is not None and window._pyglet_window.context is None:
             # User has attempted to close the window.
             raise KeyboardInterrupt
         if self._livestreamer.is_livestreaming or self._video_recorder.is_recording:
@@ -345,7 +662,7 @@ class Renderer(ToplevelResource):
         if self._livestreamer.is_livestreaming:
             self._livestreamer.livestream_frame(self._final_framebuffer)
         if self._video_recorder.is_recording:
-            self._video_recorder.record_frame(self._final_framebuffer)
+            self._video_recorder.record_frame()
 
     def start_livestream(
         self: Self
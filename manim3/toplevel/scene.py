@@ -7,8 +7,11 @@ from ..animatables.arrays.animatable_color import AnimatableColor
 from ..animatables.lights.ambient_light import AmbientLight
 from ..animatables.camera import Camera
 from ..animatables.lighting import Lighting
+from ..animatables.shape import Shape
 from ..constants.custom_typing import ColorType
+from ..lazy.lazy import Lazy
 from ..mobjects.mobject import Mobject
+from ..mobjects.shape_mobjects.shape_mobject import ShapeMobject
 from ..timelines.timeline import Timeline
 from .toplevel import Toplevel
 
@@ -44,9 +47,12 @@ class Scene(Timeline):
         self.schedule(parent_absolute_rate=lambda: Toplevel._get_scene()._scene_time)
         for scene_time in Toplevel._get_timer().frame_clock():
             self._scene_time = scene_time
-            Toplevel._get_window()._pyglet_window.dispatch_events()
+            # No events are dispatched in headless mode.
+            if (window := Toplevel._window) is not None:
+                window._pyglet_window.dispatch_events()
             self._progress()
-            Toplevel._get_window().clear_event_info_queue()
+            if window is not None:
+                window.clear_event_info_queue()
             Toplevel._get_renderer().process_frame()
             if self.terminated():
                 break
@@ -55,10 +61,17 @@ class Scene(Timeline):
         self: Self
     ) -> None:
         Toplevel._scene = self
+        if Toplevel._get_config().lazy_stats:
+            Lazy.reset_stats()
         try:
             self._run()
         except KeyboardInterrupt:
             pass
+        if Toplevel._get_config().lazy_stats:
+            Toplevel._get_logger().print_lazy_stats(type(self).__name__, Lazy.stats())
+        # Data cached for this scene is unlikely to be hit by later scenes.
+        Lazy.clear_caches()
+        Toplevel._get_context().trim_buffer_pools()
         Toplevel._scene = None
 
     # Shortcut access to root mobject.
@@ -68,6 +81,16 @@ class Scene(Timeline):
         *mobjects: Mobject
     ) -> Self:
         self._root_mobject.add(*mobjects)
+        # Triangulate added shapes ahead of the first frame.
+        Lazy.prefetch(
+            (
+                descendant._shape_
+                for mobject in mobjects
+                for descendant in mobject.iter_descendants()
+                if isinstance(descendant, ShapeMobject)
+            ),
+            (Shape._triangulation_,)
+        )
         return self
 
     def discard(